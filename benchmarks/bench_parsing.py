@@ -0,0 +1,245 @@
+"""
+Offline micro-benchmarks for the parsing hot path of the Parkeeractie client.
+
+Runs every parser against the synthetic pages in ``fixtures/`` (built to match
+the structure the client expects, not captured from the live site) and reports
+time, peak memory and retained memory blocks per call. Run from the repository root::
+
+    python -m benchmarks.bench_parsing
+    python -m benchmarks.bench_parsing --save benchmarks/baseline.json
+    python -m benchmarks.bench_parsing --compare benchmarks/baseline.json
+
+With ``--compare`` the run fails (exit code 1) when a case got slower or
+allocates more peak memory than the baseline allows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from custom_components.parkeeractie.api import (
+    STREAM_CHUNK_SIZE,
+    ParkeeractieClient,
+    _format_utc,
+    _load_relaxed,
+)
+from custom_components.parkeeractie.extract import PageScanner, extract_page
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+FIXTURES = Path(__file__).parent / "fixtures"
+MIN_RUN_TIME = 0.2  # s per repeat
+REPEATS = 5
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _scan_chunks(text: str, chunk_size: int = STREAM_CHUNK_SIZE) -> object:
+    """Feed a page to PageScanner the way the streaming reader does."""
+    scanner = PageScanner()
+    for start in range(0, len(text), chunk_size):
+        if scanner.feed(text[start : start + chunk_size]):
+            break
+    return scanner.result()
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    """Return the benchmark cases, keyed by a stable name."""
+    customer = _fixture("customer_page.html")
+    login = _fixture("login_page.html")
+    captcha = _fixture("captcha_page.html")
+    html_escaped = _fixture("payload_html_escaped.txt")
+    unicode_escaped = _fixture("payload_unicode_escaped.txt")
+    customer_payload = extract_page(customer).customer_payload or ""
+    client = ParkeeractieClient(None, "", "")  # type: ignore[arg-type]
+    now = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=UTC)
+
+    return {
+        "extract_page[customer]": lambda: extract_page(customer),
+        "extract_page[login]": lambda: extract_page(login),
+        "extract_page[captcha]": lambda: extract_page(captcha),
+        "page_scanner[customer]": lambda: _scan_chunks(customer),
+        "page_scanner[login]": lambda: _scan_chunks(login),
+        "load_relaxed[html_escaped]": lambda: _load_relaxed(html_escaped),
+        "load_relaxed[unicode_escaped]": lambda: _load_relaxed(unicode_escaped),
+        "parse_payload[customer]": lambda: client._parse_payload(  # noqa: SLF001
+            customer_payload
+        ),
+        "parse_saldo_and_time[customer, cached]": (
+            lambda: client._parse_saldo_and_time(customer_payload)  # noqa: SLF001
+        ),
+        "format_utc": lambda: _format_utc(now),
+    }
+
+
+@dataclass(slots=True)
+class Result:
+    """Measurements for one benchmark case."""
+
+    us_per_call: float
+    calls_per_s: float
+    retained_per_call: float  # blocks still alive while the results are kept
+    peak_kib: float
+
+
+def _time_per_call(func: Callable[[], object]) -> float:
+    """Return the best time per call over several repeats, in seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= MIN_RUN_TIME:
+            break
+        number *= 2
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _memory_per_call(func: Callable[[], object], calls: int = 20) -> tuple[float, int]:
+    """
+    Return (retained blocks per call, peak traced bytes of one call).
+
+    Retained blocks are the memory blocks still alive after ``calls`` calls
+    whose results are kept, so mostly the results themselves. This is not the
+    number of allocations a call makes; short-lived ones only show in the peak.
+    """
+    func()  # warm caches and lazy imports outside the measurement
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = tracemalloc.get_traced_memory()[1] - base
+        before = tracemalloc.take_snapshot()
+        results = [func() for _ in range(calls)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del results
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename"))
+    return max(blocks, 0) / calls, peak
+
+
+def run(selected: list[str] | None = None) -> dict[str, Result]:
+    """Run the (selected) benchmark cases."""
+    results = {}
+    for name, func in build_cases().items():
+        if selected and not any(s in name for s in selected):
+            continue
+        per_call = _time_per_call(func)
+        retained, peak = _memory_per_call(func)
+        results[name] = Result(
+            us_per_call=per_call * 1e6,
+            calls_per_s=1 / per_call,
+            retained_per_call=retained,
+            peak_kib=peak / 1024,
+        )
+    return results
+
+
+def _print_table(results: dict[str, Result], baseline: dict[str, dict]) -> None:
+    header = (
+        f"{'case':<40} {'us/call':>10} {'calls/s':>11} {'retained':>8} {'peak KiB':>9}"
+    )
+    if baseline:
+        header += f" {'Δtime':>8} {'Δpeak':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = (
+            f"{name:<40} {r.us_per_call:>10.2f} {r.calls_per_s:>11.0f} "
+            f"{r.retained_per_call:>8.1f} {r.peak_kib:>9.1f}"
+        )
+        if base := baseline.get(name):
+            line += (
+                f" {_delta(r.us_per_call, base['us_per_call']):>8}"
+                f" {_delta(r.peak_kib, base['peak_kib']):>8}"
+            )
+        print(line)
+
+
+def _delta(new: float, old: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old:+.0%}"
+
+
+def _regressions(
+    results: dict[str, Result],
+    baseline: dict[str, dict],
+    time_tolerance: float,
+    memory_tolerance: float,
+) -> list[str]:
+    problems = []
+    for name, r in results.items():
+        if not (base := baseline.get(name)):
+            continue
+        if r.us_per_call > base["us_per_call"] * (1 + time_tolerance):
+            problems.append(
+                f"{name}: {r.us_per_call:.2f} us/call "
+                f"(baseline {base['us_per_call']:.2f})"
+            )
+        if r.peak_kib > base["peak_kib"] * (1 + memory_tolerance) + 1:
+            problems.append(
+                f"{name}: peak {r.peak_kib:.1f} KiB (baseline {base['peak_kib']:.1f})"
+            )
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("cases", nargs="*", help="only run cases containing these")
+    parser.add_argument("--save", type=Path, help="write results as a baseline")
+    parser.add_argument("--compare", type=Path, help="compare against a baseline")
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown before failing (default 0.25)",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.10,
+        help="allowed relative peak memory growth before failing (default 0.10)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.cases)
+    baseline = json.loads(args.compare.read_text()) if args.compare else {}
+    _print_table(results, baseline)
+
+    if args.save:
+        args.save.write_text(
+            json.dumps({k: asdict(v) for k, v in results.items()}, indent=2) + "\n"
+        )
+    if problems := _regressions(
+        results, baseline, args.time_tolerance, args.memory_tolerance
+    ):
+        print("\nRegressions:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+"""
+Local stand-in for parkeerapp.utrecht.nl.
+
+Serves the synthetic fixture pages with per-account payloads so the client and
+coordinator can be exercised without touching the real service. Implements:
+
+* ``GET /`` and ``GET /Customer``: customer page with a valid session cookie,
+  otherwise the login page (the same behaviour as the real site);
+* ``GET /Account/Login``: the login page;
+* ``POST /``: credential check against the CSRF token handed out earlier;
+* ``GET /Customer/History/Transactions``: paged JSON parking history (the
+  client's guess at the real endpoint);
+* ``GET /Customer/PlanSession/GetZones``: JSON zones and tariffs, also a guess;
+* captcha pages and server-side session expiry (expired cookies);
+* configurable latency, jitter and failure rates.
+
+Run standalone with ``python -m benchmarks.fake_server --port 8080`` or embed it
+via :class:`FakeParkeeractie`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import html
+import json
+import random
+import secrets
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.parkeeractie.extract import extract_page
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SESSION_COOKIE = ".AspNetCore.Cookies"
+PASSWORD = "geheim"  # noqa: S105 - every fake account uses this password
+ZONES = [
+    {
+        "zoneCode": code,
+        "name": f"Vergunningsgebied {code}",
+        "tariffs": [
+            {
+                "days": [0, 1, 2, 3, 4, 5],
+                "start": "09:00",
+                "end": "23:00",
+                "pricePerHour": price,
+            },
+            {"days": [6], "start": "13:00", "end": "18:00", "pricePerHour": price},
+        ],
+    }
+    for code, price in (("UT-B1", 2.5), ("UT-C2", 4.8))
+]
+
+
+@dataclass(slots=True)
+class ServerConfig:
+    """Behaviour knobs of the fake server."""
+
+    latency: float = 0.05  # s, mean added per request
+    jitter: float = 0.02  # s, uniform +/- around the latency
+    failure_rate: float = 0.0  # share of requests answered with HTTP 503
+    captcha_rate: float = 0.0  # share of login pages with showCaptcha=true
+    session_ttl: float = 3600.0  # s before the server forgets a session
+    cookie_max_age: int | None = None  # Max-Age sent with the session cookie
+    seed: int | None = None
+
+
+@dataclass(slots=True)
+class ServerStats:
+    """Request counters, per route and in total."""
+
+    requests: int = 0
+    failures: int = 0
+    logins: int = 0
+    captchas: int = 0
+    per_route: dict[str, int] = field(default_factory=dict)
+
+
+def _split_template(page: str, payload: str) -> tuple[str, str]:
+    head, _, tail = page.partition(payload)
+    return head, tail
+
+
+class FakeParkeeractie:
+    """aiohttp application imitating the Parkeeractie customer site."""
+
+    def __init__(self, config: ServerConfig | None = None) -> None:
+        """Load the fixture templates and prepare the routes."""
+        self.config = config or ServerConfig()
+        self.stats = ServerStats()
+        self._random = random.Random(self.config.seed)  # noqa: S311
+        self._sessions: dict[str, tuple[str, float]] = {}  # cookie -> (email, until)
+        self._tokens: set[str] = set()
+        self._history: dict[str, list[dict[str, Any]]] = {}
+
+        customer = (FIXTURES / "customer_page.html").read_text(encoding="utf-8")
+        self._customer_template = _split_template(
+            customer, extract_page(customer).customer_payload or ""
+        )
+        self._customer_base = json.loads(
+            html.unescape(extract_page(customer).customer_payload or "{}")
+        )
+        login = (FIXTURES / "login_page.html").read_text(encoding="utf-8")
+        page = extract_page(login)
+        self._login_template = _split_template(login, page.login_payload or "")
+        self._fixture_token = page.token or ""
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get("/", self._root)
+        self.app.router.add_get("/Customer", self._root)
+        self.app.router.add_get("/Account/Login", self._login_page)
+        self.app.router.add_post("/", self._login_post)
+        self.app.router.add_get("/Customer/History/Transactions", self._transactions)
+        self.app.router.add_get("/Customer/PlanSession/GetZones", self._zones)
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self, host: str = "localhost", port: int = 0) -> str:
+        """
+        Start serving and return the base URL.
+
+        Defaults to ``localhost`` rather than an IP address: aiohttp's default
+        cookie jar ignores cookies from IP hosts, so against ``127.0.0.1`` the
+        client would never keep its session and log in on every refresh.
+        """
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        # Beide loopback-adressen op dezelfde poort, wat localhost ook oplost
+        addresses = ("127.0.0.1", "::1") if host == "localhost" else (host,)
+        bound_port = port
+        for address in addresses:
+            site = web.TCPSite(self._runner, address, bound_port)
+            try:
+                await site.start()
+            except OSError:
+                if address == addresses[0]:
+                    raise
+                continue
+            sockets = site._server.sockets if site._server else ()  # noqa: SLF001
+            if sockets:
+                bound_port = sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def expire_sessions(self) -> None:
+        """Forget all sessions, as if the server restarted."""
+        self._sessions.clear()
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        self.stats.requests += 1
+        route = f"{request.method} {request.path}"
+        self.stats.per_route[route] = self.stats.per_route.get(route, 0) + 1
+        cfg = self.config
+        delay = cfg.latency + self._random.uniform(-cfg.jitter, cfg.jitter)
+        await asyncio.sleep(max(delay, 0))
+        if self._random.random() < cfg.failure_rate:
+            self.stats.failures += 1
+            raise web.HTTPServiceUnavailable(text="Service Unavailable")
+        return await handler(request)
+
+    def _session_email(self, request: web.Request) -> str | None:
+        cookie = request.cookies.get(SESSION_COOKIE)
+        if not cookie or cookie not in self._sessions:
+            return None
+        email, until = self._sessions[cookie]
+        if until < time.monotonic():
+            del self._sessions[cookie]
+            return None
+        return email
+
+    def customer_payload(self, email: str) -> dict[str, Any]:
+        """Return a deterministic payload for an account."""
+        rnd = random.Random(email)  # noqa: S311
+        payload = json.loads(json.dumps(self._customer_base))
+        payload["addItem"]["saldo"] = round(rnd.uniform(0, 50), 2)
+        payload["permitList"][0]["timeBalance"] = rnd.randrange(0, 1200)
+        return payload
+
+    def history(self, email: str) -> list[dict[str, Any]]:
+        """Return the parking history of an account, oldest first."""
+        if email not in self._history:
+            rnd = random.Random(f"history:{email}")  # noqa: S311
+            start = datetime.now(UTC).replace(microsecond=0) - timedelta(days=60)
+            items = []
+            for tid in range(1, rnd.randrange(20, 60)):
+                start += timedelta(hours=rnd.uniform(6, 48))
+                end = start + timedelta(minutes=rnd.randrange(15, 240))
+                items.append(
+                    {
+                        "id": tid,
+                        "startTime": start.isoformat(),
+                        "endTime": end.isoformat(),
+                        "licensePlate": "AB-123-C",
+                        "zoneCode": rnd.choice(("A", "B", "C")),
+                        "cost": round((end - start).total_seconds() / 3600 * 2.5, 2),
+                    }
+                )
+            self._history[email] = items
+        return self._history[email]
+
+    def _customer_response(self, email: str) -> web.Response:
+        payload = html.escape(
+            json.dumps(self.customer_payload(email), separators=(",", ":"))
+        )
+        head, tail = self._customer_template
+        return web.Response(text=head + payload + tail, content_type="text/html")
+
+    def _login_response(self) -> web.Response:
+        captcha = self._random.random() < self.config.captcha_rate
+        if captcha:
+            self.stats.captchas += 1
+        payload = html.escape(
+            json.dumps(
+                {"returnUrl": "/Customer", "showCaptcha": captcha},
+                separators=(",", ":"),
+            )
+        )
+        token = secrets.token_urlsafe(24)
+        self._tokens.add(token)
+        head, tail = self._login_template
+        text = (head + payload + tail).replace(self._fixture_token, token)
+        return web.Response(text=text, content_type="text/html")
+
+    async def _root(self, request: web.Request) -> web.Response:
+        if email := self._session_email(request):
+            return self._customer_response(email)
+        return self._login_response()
+
+    async def _zones(self, request: web.Request) -> web.Response:
+        if not self._session_email(request):
+            raise web.HTTPFound(location="/Account/Login")
+        return web.json_response(ZONES)
+
+    async def _transactions(self, request: web.Request) -> web.Response:
+        if not (email := self._session_email(request)):
+            raise web.HTTPFound(location="/Account/Login")
+        since = int(request.query.get("sinceId", 0))
+        size = int(request.query.get("pageSize", 50))
+        newer = [t for t in self.history(email) if t["id"] > since]
+        return web.json_response({"items": newer[:size], "hasMore": len(newer) > size})
+
+    async def _login_page(self, _request: web.Request) -> web.Response:
+        return self._login_response()
+
+    async def _login_post(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        token = str(form.get("__RequestVerificationToken", ""))
+        if token not in self._tokens:
+            raise web.HTTPBadRequest(text="Invalid anti-forgery token")
+        self._tokens.discard(token)
+        email = str(form.get("Email", ""))
+        if form.get("Password") != PASSWORD or not email:
+            return self._login_response()
+
+        self.stats.logins += 1
+        cookie = secrets.token_urlsafe(32)
+        self._sessions[cookie] = (email, time.monotonic() + self.config.session_ttl)
+        response = self._customer_response(email)
+        response.set_cookie(
+            SESSION_COOKIE,
+            cookie,
+            max_age=self.config.cookie_max_age,
+            httponly=True,
+            samesite="Lax",
+        )
+        return response
+
+
+_DEFAULTS = ServerConfig()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake parkeerapp.utrecht.nl")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=_DEFAULTS.latency)
+    parser.add_argument("--jitter", type=float, default=_DEFAULTS.jitter)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--captcha-rate", type=float, default=0.0)
+    parser.add_argument("--session-ttl", type=float, default=_DEFAULTS.session_ttl)
+    return parser.parse_args()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = FakeParkeeractie(
+        ServerConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            captcha_rate=args.captcha_rate,
+            session_ttl=args.session_ttl,
+        )
+    )
+    url = await server.start(args.host, args.port)
+    print(f"Serving fake Parkeeractie on {url} (password: {PASSWORD!r})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(_serve(_parse_args()))
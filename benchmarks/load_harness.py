@@ -0,0 +1,210 @@
+"""
+End-to-end load harness: N coordinators against the fake Parkeeractie server.
+
+Starts :mod:`benchmarks.fake_server` in-process, creates one
+``ParkeeractieCoordinator`` per fake account on a throw-away Home Assistant
+instance and refreshes them for a number of rounds. Reports refresh latency
+percentiles, HTTP requests per refresh (client and server side) and event-loop
+lag. Run from the repository root::
+
+    python -m benchmarks.load_harness --accounts 20 --rounds 5
+    python -m benchmarks.load_harness --accounts 50 --failure-rate 0.05 --spread
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from benchmarks.fake_server import PASSWORD, FakeParkeeractie, ServerConfig
+from custom_components.parkeeractie.const import DOMAIN, MAX_CONCURRENT_LOGINS
+from custom_components.parkeeractie.coordinator import ParkeeractieCoordinator
+from custom_components.parkeeractie.http_pool import ParkeeractieConnectionPool
+
+LAG_PROBE_INTERVAL = 0.01  # s
+
+
+@dataclass(slots=True)
+class HarnessResults:
+    """Raw samples collected during a run."""
+
+    latencies: list[float] = field(default_factory=list)
+    round_trips: list[int] = field(default_factory=list)
+    failures: int = 0
+    loop_lag: list[float] = field(default_factory=list)
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a sleeping task."""
+
+    def __init__(self, samples: list[float]) -> None:
+        """Collect lag samples (seconds) into ``samples``."""
+        self._samples = samples
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start probing the loop."""
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+
+    async def stop(self) -> None:
+        """Stop probing the loop."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self._samples.append(max(loop.time() - start - LAG_PROBE_INTERVAL, 0))
+
+
+def _entry(index: int) -> ConfigEntry:
+    return ConfigEntry(
+        data={"username": f"account{index}@example.invalid", "password": PASSWORD},
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source="user",
+        title=f"Parkeeractie {index}",
+        unique_id=None,
+        version=1,
+    )
+
+
+async def _refresh(
+    coordinator: ParkeeractieCoordinator, delay: float, results: HarnessResults
+) -> None:
+    await asyncio.sleep(delay)
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+    results.latencies.append(time.perf_counter() - start)
+    results.round_trips.append(coordinator.client.stats.last_round_trips)
+    if not coordinator.last_update_success:
+        results.failures += 1
+
+
+def _percentiles(samples: list[float]) -> str:
+    if len(samples) < 2:  # noqa: PLR2004
+        return "n/a"
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    return (
+        f"p50 {q[49] * 1000:.1f} ms  p90 {q[89] * 1000:.1f} ms  "
+        f"p99 {q[98] * 1000:.1f} ms  max {max(samples) * 1000:.1f} ms"
+    )
+
+
+def _report(
+    args: argparse.Namespace, results: HarnessResults, server: FakeParkeeractie
+) -> None:
+    refreshes = len(results.latencies)
+    print(f"accounts {args.accounts}, rounds {args.rounds}, refreshes {refreshes}")
+    print(f"refresh latency   {_percentiles(results.latencies)}")
+    print(f"event-loop lag    {_percentiles(results.loop_lag)}")
+    if refreshes:
+        print(
+            f"requests/refresh  client {statistics.mean(results.round_trips):.2f}"
+            f"  server {server.stats.requests / refreshes:.2f}"
+            f"  (max {max(results.round_trips)})"
+        )
+    print(
+        f"failed refreshes  {results.failures}"
+        f"  (server: {server.stats.failures} injected failures,"
+        f" {server.stats.captchas} captcha pages, {server.stats.logins} logins)"
+    )
+    for route, count in sorted(server.stats.per_route.items()):
+        print(f"  {route:<24} {count}")
+
+
+async def run(args: argparse.Namespace) -> HarnessResults:
+    """Run the harness and print a report."""
+    server = FakeParkeeractie(
+        ServerConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            captcha_rate=args.captcha_rate,
+            session_ttl=args.session_ttl,
+            seed=args.seed,
+        )
+    )
+    url = await server.start()
+    results = HarnessResults()
+    monitor = LoopLagMonitor(results.loop_lag)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        login_limiter = asyncio.Semaphore(args.max_logins)
+        pool = ParkeeractieConnectionPool(hass)
+        coordinators = [
+            ParkeeractieCoordinator(
+                hass, _entry(i), base_url=url, login_limiter=login_limiter, pool=pool
+            )
+            for i in range(args.accounts)
+        ]
+        monitor.start()
+        try:
+            for round_no in range(args.rounds):
+                if round_no:
+                    await asyncio.sleep(args.interval)
+                step = args.interval / args.accounts if args.spread else 0
+                await asyncio.gather(
+                    *(
+                        _refresh(coordinator, i * step, results)
+                        for i, coordinator in enumerate(coordinators)
+                    )
+                )
+        finally:
+            await monitor.stop()
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+            await pool.async_close()
+            await hass.async_stop(force=True)
+            await server.stop()
+
+    _report(args, results, server)
+    return results
+
+
+_DEFAULTS = ServerConfig()
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parkeeractie load harness")
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="seconds between rounds"
+    )
+    parser.add_argument(
+        "--spread",
+        action="store_true",
+        help="spread each round's refreshes over the interval instead of a burst",
+    )
+    parser.add_argument(
+        "--max-logins",
+        type=int,
+        default=MAX_CONCURRENT_LOGINS,
+        help="concurrent logins allowed across accounts",
+    )
+    parser.add_argument("--latency", type=float, default=_DEFAULTS.latency)
+    parser.add_argument("--jitter", type=float, default=_DEFAULTS.jitter)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--captcha-rate", type=float, default=0.0)
+    parser.add_argument("--session-ttl", type=float, default=_DEFAULTS.session_ttl)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(_parse_args()))
@@ -4,8 +4,25 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from .const import DOMAIN
+from homeassistant.core import callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
+
+from .api import shutdown_parse_pool
+from .const import (
+    DATA_HANDOFF,
+    DATA_HISTORY,
+    DATA_POOL,
+    DATA_SCHEDULER,
+    DOMAIN,
+    STORAGE_VERSION,
+)
 from .coordinator import ParkeeractieCoordinator
+from .debug_capture import DebugCaptureStore
+from .history import HistoryStore
+from .http_pool import ParkeeractieConnectionPool
+from .scheduler import ParkeeractieScheduler
+from .statistics import async_clear_spend
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -14,16 +31,59 @@ if TYPE_CHECKING:
 PLATFORMS: list[str] = ["sensor", "binary_sensor"]
 
 
+@callback
+def _async_get_scheduler(hass: HomeAssistant) -> ParkeeractieScheduler:
+    """Return the scheduler shared by all config entries, creating it if needed."""
+    if DATA_SCHEDULER not in hass.data:
+        hass.data[DATA_SCHEDULER] = ParkeeractieScheduler(hass)
+    return hass.data[DATA_SCHEDULER]
+
+
+@callback
+def _async_get_history(hass: HomeAssistant) -> HistoryStore:
+    """Return the parking history store shared by all config entries."""
+    if DATA_HISTORY not in hass.data:
+        hass.data[DATA_HISTORY] = HistoryStore(hass)
+    return hass.data[DATA_HISTORY]
+
+
+@callback
+def _async_get_pool(hass: HomeAssistant) -> ParkeeractieConnectionPool:
+    """Return the HTTP connection pool shared by all config entries."""
+    if DATA_POOL not in hass.data:
+        hass.data[DATA_POOL] = ParkeeractieConnectionPool(hass)
+    return hass.data[DATA_POOL]
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Parkeeractie from a config entry."""
+    scheduler = _async_get_scheduler(hass)
     coordinator = ParkeeractieCoordinator(
         hass,
-        username=entry.data["username"],
-        password=entry.data["password"],
+        entry,
+        login_limiter=scheduler.login_limiter,
+        history=_async_get_history(hass),
+        pool=_async_get_pool(hass),
     )
-    await coordinator.async_config_entry_first_refresh()
+    # Net ingelogd in de config flow: die sessie en gegevens overnemen. Anders
+    # opgeslagen gegevens tonen en op de achtergrond verversen, zodat setup niet
+    # op de site hoeft te wachten.
+    poll_now = False
+    if handoff := hass.data.get(DATA_HANDOFF, {}).pop(entry.data["username"], None):
+        coordinator.async_adopt_session(handoff["cookies"], handoff["snapshot"])
+    elif await coordinator.async_load_session():
+        poll_now = True
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await coordinator.async_shutdown()
+            raise
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    scheduler.async_add(entry.entry_id, coordinator)
+    if poll_now:
+        scheduler.async_poll_now(entry.entry_id)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
@@ -33,6 +93,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload parkeeractie integration."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        scheduler: ParkeeractieScheduler = hass.data[DATA_SCHEDULER]
+        scheduler.async_remove(entry.entry_id)
+        if not scheduler.entry_ids:
+            scheduler.async_shutdown()
+            hass.data.pop(DATA_SCHEDULER)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.async_shutdown()
+        if not hass.data[DOMAIN]:
+            await hass.data.pop(DATA_HISTORY).async_close()
+            await hass.data.pop(DATA_POOL).async_close()
+            shutdown_parse_pool()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data, statistics and issues of a deleted entry."""
+    ir.async_delete_issue(hass, DOMAIN, f"captcha_{entry.entry_id}")
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await DebugCaptureStore(hass, entry.entry_id).async_remove()
+    async_clear_spend(hass, entry.entry_id)
+    history = _async_get_history(hass)
+    await history.async_remove_account(entry.unique_id or entry.entry_id)
+    if not hass.data.get(DOMAIN):
+        await hass.data.pop(DATA_HISTORY).async_close()
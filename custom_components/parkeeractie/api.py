@@ -2,33 +2,68 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
 import contextlib
+import functools
+import hashlib
 import html as ihtml
 import json
 import logging
-import re
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from pathlib import Path
-from typing import TYPE_CHECKING
-from zoneinfo import ZoneInfo
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from http.cookies import Morsel, SimpleCookie
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from bs4 import BeautifulSoup
+from aiohttp import ClientError, ClientTimeout
+from yarl import URL
 
-from .const import BASE_URL, HEADERS, LOGIN_URL
+from .const import BASE_URL, DEFAULT_SLOW_PARSE_MS, HEADERS
+from .extract import PageData, PageScanner, extract_page
+from .models import AccountSnapshot, Transaction, Zone
 
 if TYPE_CHECKING:
-    from aiohttp import ClientSession
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 
-_LOGGER = logging.getLogger(__name__)
-
-_login_payload_re = re.compile(
-    r"login\.init\(\s*(['\"])(?P<payload>.+?)\1\)\s*;", re.DOTALL
-)
-_customer_payload_re = re.compile(
-    r"customerLayout\.init\([^,]+,\s*(['\"])(?P<payload>.+?)\1\)\s*;", re.DOTALL
-)
+    from aiohttp import ClientResponse, ClientSession, StreamReader
 
-_DEFAULT_TZ = ZoneInfo("Europe/Amsterdam")
+_LOGGER = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+# Trace van de verversing (of het losse verzoek) in de huidige taak
+_TRACE: ContextVar[RefreshTrace | None] = ContextVar("parkeeractie_trace", default=None)
+
+STREAM_CHUNK_SIZE = 8192  # bytes read per step while scanning a page
+DRAIN_LIMIT = 16 * 1024  # bytes of a page tail still read to keep the connection
+PARSE_CACHE_SIZE = 4  # parsed payloads remembered per account
+PARSE_OFFLOAD_SIZE = 16 * 1024  # chars; larger payloads are decoded off the loop
+PARSE_WORKERS = 2  # threads decoding large payloads, shared by all accounts
+TRACE_HISTORY = 100  # refreshes kept for the rolling timing statistics
+FRESHNESS_WINDOW = 5.0  # s; a refresh this recent is answered from memory
+
+# Per verzoek, inclusief het lezen van de body; een POST (inloggen, acties) mag
+# langer op het antwoord wachten dan een GET
+GET_TIMEOUT = ClientTimeout(total=30, connect=10, sock_read=15)
+POST_TIMEOUT = ClientTimeout(total=45, connect=10, sock_read=30)
+
+# Niet gecontroleerd tegen de echte site: het pad, de parameters en de velden
+# van de historie zijn afgeleid van de andere klantpagina's
+HISTORY_PATH = "/Customer/History/Transactions"
+# Ook niet gecontroleerd: zones en tarieven zoals de planpagina ze zou laden
+ZONES_PATH = "/Customer/PlanSession/GetZones"
+HISTORY_PAGE_SIZE = 100
+HISTORY_MAX_PAGES = 50  # per sync; the rest follows on the next one
+
+# Which path of login_and_fetch a refresh took
+BRANCH_SESSION = "session"  # stored session accepted, one GET
+BRANCH_LOGIN = "login"  # login form posted
+BRANCH_ALT_LOGIN = "alt_login"  # login form fetched from /Account/Login first
 
 
 def _format_utc(dt: datetime) -> str:
@@ -37,63 +72,457 @@ def _format_utc(dt: datetime) -> str:
     return f"{dt_utc.strftime('%Y-%m-%dT%H:%M:%S')}.000Z"
 
 
+def _unescape_js(s: str) -> str:
+    return s.replace(r"\\", "\\").replace(r"\"", '"').replace(r"\'", "'")
+
+
+def _decode_unicode_escape(s: str) -> str:
+    return s.encode("utf-8").decode("unicode_escape")
+
+
+def _decode_order(s: str) -> tuple[Callable[[str], str], ...]:
+    """Return the decode strategies for a payload, most likely first."""
+    if "\\" not in s:
+        return (str,)  # plain JSON, nothing else to try
+    if "\\x" in s:
+        return (_decode_unicode_escape, str, _unescape_js)
+    if s.lstrip()[:2] in ("{\\", "[\\"):
+        return (_unescape_js, _decode_unicode_escape, str)
+    return (str, _unescape_js, _decode_unicode_escape)
+
+
 def _load_relaxed(s: str) -> dict:
-    """
+    r"""
     Parse JSON that may be HTML-escaped or lightly malformed.
 
-    Tries a couple of safe variants before finally attempting a unicode_escape decode.
-    Avoids logging for each failed candidate to reduce noise; logs once on the final
-    fallback.
+    Looks at the payload once to decide how it is encoded (HTML entities, JS
+    string escapes such as ``\"``, or ``\xNN`` escapes) and decodes it that way,
+    so the common case builds a single copy. The other variants are only tried
+    if that fails. Logs once on the final failure.
     """
-    s1 = ihtml.unescape(s)
-    candidates = (
-        s1,
-        s1.replace(r"\\", "\\").replace(r"\"", '"').replace(r"\'", "'"),
-    )
-    for candidate in candidates:
+    s1 = ihtml.unescape(s) if "&" in s else s
+    strategies = _decode_order(s1)
+    for decode in strategies[:-1]:
         try:
-            return json.loads(candidate)
-        except (ValueError, json.JSONDecodeError):
+            return json.loads(decode(s1))
+        except ValueError:
             # Silent per-candidate failure; we'll try the next strategy.
             continue
     try:
-        return json.loads(s1.encode("utf-8").decode("unicode_escape"))
-    except (ValueError, json.JSONDecodeError) as e:
+        return json.loads(strategies[-1](s1))
+    except ValueError as e:
         _LOGGER.debug("Relaxed JSON parse fallback failed: %s", e)
         raise
 
 
-def _ensure_www() -> str:
-    """Ensure www directory exists and return its path."""
-    www_dir = "config/www"
-    with contextlib.suppress(Exception):
-        Path(www_dir).mkdir(parents=True, exist_ok=True)
-    return www_dir
+class _LRUCache:
+    """A tiny least-recently-used map of payload digests to parse results."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._data: OrderedDict[bytes, AccountSnapshot] = OrderedDict()
+
+    def get(self, key: bytes) -> AccountSnapshot | None:
+        if (value := self._data.get(key)) is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: bytes, value: AccountSnapshot) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+class ParkeeractieError(Exception):
+    """Base class for errors talking to Parkeeractie."""
+
+
+class ParkeeractieConnectionError(ParkeeractieError):
+    """The server could not be reached or answered with a server error."""
+
+
+class ParkeeractieAuthError(ParkeeractieError):
+    """The server rejected the credentials."""
+
+
+class ParkeeractieSessionError(ParkeeractieError):
+    """The server no longer accepts the stored session."""
+
+
+class ParkeeractieCaptchaError(ParkeeractieError):
+    """The login page asks for a reCAPTCHA, so logging in cannot be automated."""
+
+
+class ParkeeractieParseError(ParkeeractieError):
+    """A page did not have the expected payload or form fields."""
+
+
+def _raise_for_status(r: ClientResponse) -> None:
+    if r.status in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+        msg = f"Sessie niet (meer) geldig: HTTP {r.status}."
+        raise ParkeeractieSessionError(msg)
+    if r.status >= HTTPStatus.INTERNAL_SERVER_ERROR or (
+        r.status == HTTPStatus.TOO_MANY_REQUESTS
+    ):
+        msg = f"Server antwoordde met HTTP {r.status}."
+        raise ParkeeractieConnectionError(msg)
+    if r.status >= HTTPStatus.BAD_REQUEST:
+        msg = f"Onverwacht antwoord van de server: HTTP {r.status}."
+        raise ParkeeractieError(msg)
+
+
+async def _drain(content: StreamReader, limit: int) -> int:
+    """Read and discard the rest of a body, up to about ``limit`` bytes."""
+    drained = 0
+    while drained <= limit and (chunk := await content.readany()):
+        drained += len(chunk)
+    return drained
+
+
+@functools.cache
+def _parse_pool() -> ThreadPoolExecutor:
+    """Return the thread pool for large payloads, created on first use."""
+    return ThreadPoolExecutor(
+        max_workers=PARSE_WORKERS, thread_name_prefix="parkeeractie_parse"
+    )
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the threads of the parse pool; it is created again when needed."""
+    if _parse_pool.cache_info().currsize:
+        _parse_pool().shutdown(wait=False)
+        _parse_pool.cache_clear()
+
+
+def _login_settings(raw_payload: str) -> dict:
+    """Decode the ``login.init`` payload."""
+    try:
+        return _load_relaxed(raw_payload)
+    except (ValueError, UnicodeError) as err:
+        msg = "Kon login.init payload niet lezen."
+        raise ParkeeractieParseError(msg) from err
+
+
+def _decode_json(text: str) -> Any:
+    """Decode a JSON answer; a login page instead means the session expired."""
+    try:
+        return json.loads(text) if text.strip() else {}
+    except ValueError as err:
+        # Verlopen sessie: de server stuurt door naar de loginpagina
+        if extract_page(text).login_payload is not None:
+            msg = "Sessie verlopen; opnieuw inloggen nodig."
+            raise ParkeeractieSessionError(msg) from err
+        msg = "Onverwacht antwoord van de server; geen JSON."
+        raise ParkeeractieParseError(msg) from err
+
+
+def _captcha_required(login_settings: dict) -> bool:
+    return bool(login_settings.get("showCaptcha") or login_settings.get("ShowCaptcha"))
+
+
+def _morsel_expiry(morsel: Morsel, now: float) -> float | None:
+    """Return the absolute expiry (epoch seconds) of a cookie, if it has one."""
+    if max_age := morsel["max-age"]:
+        with contextlib.suppress(ValueError):
+            return now + int(max_age)
+    if expires := morsel["expires"]:
+        with contextlib.suppress(TypeError, ValueError):
+            return parsedate_to_datetime(expires).timestamp()
+    return None
+
+
+@dataclass(slots=True)
+class RefreshTrace:
+    """Where the time and traffic of one refresh went. Durations in ms."""
+
+    branch: str | None = None
+    total_ms: float = 0.0
+    get_ms: float = 0.0
+    post_ms: float = 0.0
+    login_wait_ms: float = 0.0
+    parse_ms: float = 0.0
+    bytes_received: int = 0
+    round_trips: int = 0  # requests, redirects included
+    redirects: int = 0
+    error: str | None = None
+
+
+TRACE_METRICS = (
+    "total_ms",
+    "get_ms",
+    "post_ms",
+    "login_wait_ms",
+    "parse_ms",
+    "bytes_received",
+    "redirects",
+)
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Return the nearest-rank percentile of an ascending, non-empty list."""
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+@dataclass(slots=True)
+class ClientStats:
+    """Round-trip counters and recent traces of the refreshes done by a client."""
+
+    refreshes: int = 0
+    logins: int = 0
+    round_trips: int = 0
+    last_round_trips: int = 0
+    last_login: datetime | None = None
+    parse_cache_hits: int = 0
+    coalesced: int = 0  # calls answered by a running or just finished refresh
+    branches: dict[str, int] = field(default_factory=dict)
+    history: deque[RefreshTrace] = field(
+        default_factory=lambda: deque(maxlen=TRACE_HISTORY)
+    )
+
+    @property
+    def last_trace(self) -> RefreshTrace | None:
+        """Return the trace of the last refresh."""
+        return self.history[-1] if self.history else None
+
+    def record(self, trace: RefreshTrace) -> None:
+        """Add the trace of a finished refresh."""
+        self.history.append(trace)
+        if trace.branch is not None:
+            self.branches[trace.branch] = self.branches.get(trace.branch, 0) + 1
+
+    def summary(self, metric: str) -> dict[str, float]:
+        """Return rolling percentiles of a trace metric over recent refreshes."""
+        ordered = sorted(getattr(t, metric) for t in self.history)
+        if not ordered:
+            return {}
+        return {
+            "p50": round(_percentile(ordered, 0.5), 2),
+            "p90": round(_percentile(ordered, 0.9), 2),
+            "max": round(ordered[-1], 2),
+            "mean": round(sum(ordered) / len(ordered), 2),
+        }
 
 
 class ParkeeractieClient:
     """Client for interacting with the Parkeeractie Utrecht API."""
 
-    def __init__(self, session: ClientSession, username: str, password: str) -> None:
-        """Initialize the client with session and credentials."""
+    def __init__(  # noqa: PLR0913
+        self,
+        session: ClientSession,
+        username: str,
+        password: str,
+        base_url: str = BASE_URL,
+        login_limiter: asyncio.Semaphore | None = None,
+        debug_capture: Callable[[str, str], None] | None = None,
+        slow_parse_ms: float = DEFAULT_SLOW_PARSE_MS,
+    ) -> None:
+        """
+        Initialize the client with session and credentials.
+
+        The session should be dedicated to this client: its cookie jar holds the
+        authenticated session of this account and is exported/imported as a whole.
+        ``base_url`` only needs overriding to point the client at a stand-in server.
+        ``login_limiter`` is held while logging in, to cap concurrent logins across
+        accounts; the already-logged-in GET does not wait for it.
+        ``debug_capture(label, html)`` is called with pages that could not be
+        understood; it must not block. Parse steps taking longer than
+        ``slow_parse_ms`` are logged as a warning; the attribute of that name
+        can be changed later.
+        """
         self._session = session
+        self._login_limiter = login_limiter or contextlib.nullcontext()
+        self._base_url = base_url.rstrip("/")
+        self._login_url = f"{self._base_url}/"
         self._username = username
         self._password = password
+        self._cookie_expiry: dict[str, float] = {}
+        self._session_expires: float | None = None
+        self._cookies_changed = False
+        self.stats = ClientStats()
+        self._parse_cache = _LRUCache(PARSE_CACHE_SIZE)
+        self._debug_capture = debug_capture
+        self.slow_parse_ms = slow_parse_ms
+        self._inflight: asyncio.Task[AccountSnapshot] | None = None
+        self._fresh: tuple[float, AccountSnapshot] | None = None  # (monotonic, data)
+
+    @property
+    def _trace(self) -> RefreshTrace:
+        """
+        Return the trace that requests in the current task count towards.
+
+        A refresh runs in a task of its own, so standalone requests running at
+        the same time (a history sync, say) never add to its trace, nor to one
+        already recorded in ``stats``.
+        """
+        if (trace := _TRACE.get()) is None:
+            # Buiten een verversing of los verzoek: niets om bij te houden
+            trace = RefreshTrace()
+            _TRACE.set(trace)
+        return trace
+
+    @property
+    def session_expires(self) -> datetime | None:
+        """Return when the authenticated session expires, if the server told us."""
+        if self._session_expires is None:
+            return None
+        return datetime.fromtimestamp(self._session_expires, UTC)
+
+    @property
+    def cookies_changed(self) -> bool:
+        """Return True if the server set cookies since the last export."""
+        return self._cookies_changed
+
+    def export_cookies(self) -> list[dict[str, Any]]:
+        """Return the cookie jar as JSON-serialisable dicts for persistent storage."""
+        self._cookies_changed = False
+        return [
+            {
+                "name": morsel.key,
+                "value": morsel.value,
+                "domain": morsel["domain"],
+                "path": morsel["path"] or "/",
+                "expires": self._cookie_expiry.get(morsel.key),
+                "secure": bool(morsel["secure"]),
+                "httponly": bool(morsel["httponly"]),
+            }
+            for morsel in self._session.cookie_jar
+        ]
+
+    def import_cookies(self, cookies: Iterable[dict[str, Any]]) -> None:
+        """Load previously exported cookies, skipping those that have expired."""
+        now = time.time()
+        jar = SimpleCookie()
+        for c in cookies:
+            expires = c.get("expires")
+            if expires is not None and expires <= now:
+                continue
+            name = c["name"]
+            jar[name] = c["value"]
+            morsel = jar[name]
+            morsel["path"] = c.get("path") or "/"
+            if c.get("domain"):
+                morsel["domain"] = c["domain"]
+            if expires is not None:
+                morsel["expires"] = format_datetime(
+                    datetime.fromtimestamp(expires, UTC), usegmt=True
+                )
+                self._cookie_expiry[name] = expires
+            morsel["secure"] = c.get("secure", False)
+            morsel["httponly"] = c.get("httponly", False)
+        if jar:
+            self._session.cookie_jar.update_cookies(
+                jar, response_url=URL(self._base_url)
+            )
+        self._update_session_expiry()
+        _LOGGER.debug("Loaded %d stored cookies", len(jar))
+
+    def _update_session_expiry(self) -> None:
+        # Informatief: de vroegste expiry die nog in de toekomst ligt. Of de sessie
+        # nog geldig is beslist de server; login_and_fetch ziet dat bij de GET.
+        now = time.time()
+        self._session_expires = min(
+            (e for e in self._cookie_expiry.values() if e > now), default=None
+        )
+
+    def _track_response(self, r: ClientResponse) -> None:
+        """Count the round trips of a response and record the cookies it set."""
+        self._trace.round_trips += len(r.history) + 1
+        self._trace.redirects += len(r.history)
+        now = time.time()
+        for resp in (*r.history, r):
+            for name, morsel in resp.cookies.items():
+                self._cookies_changed = True
+                expiry = _morsel_expiry(morsel, now)
+                if expiry is None:
+                    self._cookie_expiry.pop(name, None)
+                elif expiry > now:
+                    self._cookie_expiry[name] = expiry
+                else:
+                    # De server verwijdert alleen deze cookie (zoals ASP.NET met
+                    # TempData doet), niet de hele sessie
+                    self._cookie_expiry.pop(name, None)
+                    self._session.cookie_jar.clear(lambda m, name=name: m.key == name)
+        self._update_session_expiry()
+
+    async def _read_page(self, r: ClientResponse) -> tuple[str, PageData]:
+        """
+        Stream a page body and stop reading once its payload is complete.
+
+        The body is decoded chunk by chunk and scanned as it arrives, so the tail
+        of the page (and a full-size bytes copy of it) is never held in memory.
+        """
+        scanner = PageScanner()
+        decoder = codecs.getincrementaldecoder(r.charset or "utf-8")(errors="replace")
+        size = 0
+        scan_ms = slowest_ms = 0.0
+        async for chunk in r.content.iter_chunked(STREAM_CHUNK_SIZE):
+            size += len(chunk)
+            start = time.perf_counter()
+            done = scanner.feed(decoder.decode(chunk))
+            step_ms = (time.perf_counter() - start) * 1000
+            scan_ms += step_ms
+            slowest_ms = max(slowest_ms, step_ms)
+            if done:
+                # Een korte rest lezen we toch, anders sluit aiohttp de verbinding
+                size += await _drain(r.content, DRAIN_LIMIT)
+                _LOGGER.debug(
+                    "Payload complete; read %d bytes of %s%s",
+                    size,
+                    r.url,
+                    "" if r.content.at_eof() else ", skipping the rest",
+                )
+                break
+        else:
+            scanner.feed(decoder.decode(b"", final=True))
+        self._trace.bytes_received += size
+        # Elke stap draait op de event loop; de traagste blokkeert het langst
+        self._trace.parse_ms += scan_ms
+        self._check_slow_parse("scan", slowest_ms, size, on_loop=True)
+        return scanner.text, scanner.result()
+
+    @contextlib.asynccontextmanager
+    async def _request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[ClientResponse]:
+        """
+        Send a request, translating network and HTTP errors to our own.
+
+        The time until the caller is done with the response (body read included)
+        is added to the trace of the current refresh. Each request is bounded by
+        ``GET_TIMEOUT`` or ``POST_TIMEOUT``, so a stalled server cannot hold up a
+        refresh past its poll interval.
+        """
+        timeout = GET_TIMEOUT if method == "GET" else POST_TIMEOUT
+        start = time.perf_counter()
+        try:
+            async with self._session.request(
+                method, url, allow_redirects=True, timeout=timeout, **kwargs
+            ) as r:
+                self._track_response(r)
+                _LOGGER.debug("%s %s -> %s (%s)", method, url, str(r.url), r.status)
+                _raise_for_status(r)
+                yield r
+        except (ClientError, TimeoutError) as err:
+            msg = f"Geen verbinding met {self._base_url}: {err!r}"
+            raise ParkeeractieConnectionError(msg) from err
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            if method == "GET":
+                self._trace.get_ms += elapsed
+            else:
+                self._trace.post_ms += elapsed
 
-    async def _get(self, url: str) -> str:
-        async with self._session.get(url, headers=HEADERS, allow_redirects=True) as r:
-            text = await r.text()
-            _LOGGER.debug("GET %s -> %s (%s)", url, str(r.url), r.status)
-            return text
+    async def _get(self, url: str) -> tuple[str, PageData]:
+        async with self._request("GET", url, headers=HEADERS) as r:
+            return await self._read_page(r)
 
-    async def _post_form(self, url: str, data: dict, referer: str) -> str:
+    async def _post_form(
+        self, url: str, data: dict, referer: str
+    ) -> tuple[str, PageData]:
         headers = {**HEADERS, "Referer": referer}
-        async with self._session.post(
-            url, headers=headers, data=data, allow_redirects=True
-        ) as r:
-            text = await r.text()
-            _LOGGER.debug("POST %s -> %s (%s)", url, str(r.url), r.status)
-            return text
+        async with self._request("POST", url, headers=headers, data=data) as r:
+            return await self._read_page(r)
 
     async def _post_json(
         self, url: str, data: dict, referer: str, extra_headers: dict | None = None
@@ -101,72 +530,122 @@ class ParkeeractieClient:
         headers = {
             **HEADERS,
             "Referer": referer,
-            "Origin": BASE_URL,
+            "Origin": self._base_url,
             "Content-Type": "application/json; charset=UTF-8",
             "X-Requested-With": "XMLHttpRequest",
         }
         if extra_headers:
             headers.update(extra_headers)
-        async with self._session.post(
-            url, headers=headers, json=data, allow_redirects=True
-        ) as r:
-            text = await r.text()
-            _LOGGER.debug("POST JSON %s -> %s (%s)", url, str(r.url), r.status)
-            return text
-
-    async def login_and_fetch(self) -> tuple[float | None, str | None]:
-        """Login to the service and fetch saldo and current time data."""
+        async with self._request("POST", url, headers=headers, json=data) as r:
+            body = await r.read()
+            self._trace.bytes_received += len(body)
+            return body.decode(r.charset or "utf-8", errors="replace")
+
+    async def login_and_fetch(
+        self, max_age: float = FRESHNESS_WINDOW
+    ) -> AccountSnapshot:
+        """
+        Fetch saldo and current time data, logging in only when needed.
+
+        With a valid session cookie this is a single GET; the login form is only
+        posted when the server serves the login page instead of the customer page.
+
+        Calls for the same account are single-flight: while a refresh runs, other
+        callers wait for its result instead of starting their own, and a result
+        at most ``max_age`` seconds old is returned without any request. Both
+        count as ``stats.coalesced``.
+        """
+        if self._fresh is not None and max_age > 0:
+            fetched, data = self._fresh
+            if time.monotonic() - fetched <= max_age:
+                self.stats.coalesced += 1
+                return data
+        if (task := self._inflight) is None:
+            task = asyncio.get_running_loop().create_task(self._refresh())
+            task.add_done_callback(self._refresh_done)
+            self._inflight = task
+        else:
+            self.stats.coalesced += 1
+        # Een geannuleerde aanroeper annuleert niet de verversing van de anderen
+        return await asyncio.shield(task)
+
+    def _refresh_done(self, task: asyncio.Task[AccountSnapshot]) -> None:
+        self._inflight = None
+        if not task.cancelled() and task.exception() is None:
+            self._fresh = (time.monotonic(), task.result())
+
+    async def _refresh(self) -> AccountSnapshot:
+        self.stats.refreshes += 1
+        _TRACE.set(trace := RefreshTrace())
+        start = time.perf_counter()
+        try:
+            return await self._login_and_fetch()
+        except Exception as err:
+            trace.error = type(err).__name__
+            raise
+        finally:
+            trace.total_ms = (time.perf_counter() - start) * 1000
+            self.stats.record(trace)
+            # Alleen verversingen tellen mee; losse verzoeken hebben hun eigen trace
+            self.stats.last_round_trips = trace.round_trips
+            self.stats.round_trips += trace.round_trips
+            _LOGGER.debug(
+                "Refresh used %d round trip(s), %.0f ms (%s)",
+                trace.round_trips,
+                trace.total_ms,
+                trace.branch,
+            )
+
+    async def _login_and_fetch(self) -> AccountSnapshot:
         # 1) GET "/" - can be login or already logged in
-        html = await self._get(LOGIN_URL)
+        html, page = await self._get(self._login_url)
 
         # a) Als we al ingelogd zijn, staat de payload direct in de pagina
-        saldo, current_time = self._parse_saldo_and_time(html)
-        if saldo is not None or current_time is not None:
+        data = await self._async_parse_saldo_and_time(page.customer_payload)
+        if data.found:
             # We waren al ingelogd; niets posten, meteen teruggeven
-            return saldo, current_time
-
-        # b) Geen ingelogde payload? Probeer expliciete login-URL
-        if "login.init" not in html.lower():
-            alt_url = f"{BASE_URL}/Account/Login"
-            html = await self._get(alt_url)
-
-        m = _login_payload_re.search(html)
-        if not m:
+            self._trace.branch = BRANCH_SESSION
+            return data
+
+        # b) Sessie afgewezen: de server toont de loginpagina
+        _LOGGER.debug("Session not accepted by server; logging in")
+        self._trace.branch = BRANCH_LOGIN
+        wait_start = time.perf_counter()
+        async with self._login_limiter:
+            self._trace.login_wait_ms = (time.perf_counter() - wait_start) * 1000
+            return await self._login(html, page)
+
+    async def _login(self, html: str, page: PageData) -> AccountSnapshot:
+        self.stats.logins += 1
+        self.stats.last_login = datetime.now(UTC)
+
+        # Geen ingelogde payload? Probeer expliciete login-URL
+        if page.login_payload is None:
+            alt_url = f"{self._base_url}/Account/Login"
+            self._trace.branch = BRANCH_ALT_LOGIN
+            html, page = await self._get(alt_url)
+
+        if page.login_payload is None:
             # Laatste kans: misschien staat de payload alsnog in deze pagina
-            saldo, current_time = self._parse_saldo_and_time(html)
-            if saldo is not None or current_time is not None:
-                return saldo, current_time
+            data = await self._async_parse_saldo_and_time(page.customer_payload)
+            if data.found:
+                return data
 
             # Nog steeds geen login/init en geen ingelogde payload -> debugdump + error
-            path = Path(_ensure_www()) / "parkeeractie_login_debug.html"
-            try:
-                path.write_text(html, encoding="utf-8")
-                _LOGGER.error(
-                    "Kon login.init payload niet vinden. "
-                    "HTML opgeslagen naar %s "
-                    "(open via /local/parkeeractie_login_debug.html)",
-                    path,
-                )
-            except Exception:
-                _LOGGER.exception("Kon debug HTML niet schrijven")
+            self._capture("no_login_init", html)
             msg = "Kon login.init payload niet vinden."
-            raise ValueError(msg)
+            raise ParkeeractieParseError(msg)
 
         # 2) CSRF + captcha check
-        soup = BeautifulSoup(html, "html.parser")
-        token_el = soup.find("input", {"name": "__RequestVerificationToken"})
-        if not token_el or not token_el.get("value"):
+        csrf = page.token
+        if not csrf:
             msg = "CSRF-token niet gevonden op loginpagina."
-            raise ValueError(msg)
-        csrf = token_el["value"]
+            raise ParkeeractieParseError(msg)
 
-        login_payload = _load_relaxed(m.group("payload"))
-        show_captcha = bool(
-            login_payload.get("showCaptcha") or login_payload.get("ShowCaptcha")
-        )
-        if show_captcha:
+        login_payload = _login_settings(page.login_payload)
+        if _captcha_required(login_payload):
             msg = "reCAPTCHA staat aan (showCaptcha=true) — inloggen afgebroken."
-            raise ValueError(msg)
+            raise ParkeeractieCaptchaError(msg)
 
         # 3) POST credentials
         form_data = {
@@ -178,70 +657,162 @@ class ParkeeractieClient:
             "ScreenWidth": "1920",
         }
 
-        html = await self._post_form(LOGIN_URL, form_data, LOGIN_URL)
-        saldo, current_time = self._parse_saldo_and_time(html)
-        if saldo is not None or current_time is not None:
-            return saldo, current_time
-        msg = "Inloggen is mislukt of geen account gevonden."
-        raise ValueError(msg)
-
-    def _parse_saldo_and_time(self, html: str) -> tuple[float | None, str | None]:
-        payload = None
-        if m := _customer_payload_re.search(html):
+        html, page = await self._post_form(self._login_url, form_data, self._login_url)
+        data = await self._async_parse_saldo_and_time(page.customer_payload)
+        if data.found:
+            return data
+        if page.login_payload is None:
+            self._capture("unknown_after_login", html)
+            msg = "Onbekende pagina na inloggen; geen account gevonden."
+            raise ParkeeractieParseError(msg)
+        # Weer de loginpagina: gegevens afgewezen, of nu wel een captcha
+        if _captcha_required(_login_settings(page.login_payload)):
+            msg = "reCAPTCHA gevraagd na inlogpoging — inloggen afgebroken."
+            raise ParkeeractieCaptchaError(msg)
+        msg = "Inloggen is mislukt; controleer e-mailadres en wachtwoord."
+        raise ParkeeractieAuthError(msg)
+
+    async def _with_session(self, request: Callable[[], Awaitable[_T]]) -> _T:
+        """Run a request; renew a rejected session once and run it again."""
+        # Een eigen trace, los van die van een (lopende) verversing
+        token = _TRACE.set(RefreshTrace())
+        try:
             try:
-                payload = _load_relaxed(m.group("payload"))
-            except (json.JSONDecodeError, UnicodeError) as e:
-                _LOGGER.debug(
-                    "Payload parse error (%s): %s", _customer_payload_re.pattern, e
-                )
+                return await request()
+            except ParkeeractieSessionError:
+                _LOGGER.debug("Session rejected; refreshing it")
+                await self.login_and_fetch(max_age=0)
+            return await request()
+        finally:
+            _TRACE.reset(token)
+
+    async def fetch_transactions(
+        self, after_id: int | None = None
+    ) -> list[Transaction]:
+        """
+        Fetch the transactions newer than ``after_id``, oldest first.
+
+        Follows the pages of the history endpoint until there are no more, so
+        when nothing happened since ``after_id`` this is a single request.
+        """
+        return await self._with_session(lambda: self._fetch_transactions(after_id))
+
+    async def _fetch_transactions(self, after_id: int | None) -> list[Transaction]:
+        url = f"{self._base_url}{HISTORY_PATH}"
+        transactions: list[Transaction] = []
+        for _ in range(HISTORY_MAX_PAGES):
+            params = {"pageSize": HISTORY_PAGE_SIZE}
+            if after_id is not None:
+                params["sinceId"] = after_id
+            result = _decode_json(await self._get_json(url, params))
+            items = result.get("items") if isinstance(result, dict) else result
+            if not isinstance(items, list):
+                msg = "Onverwacht antwoord van de parkeerhistorie."
+                raise ParkeeractieParseError(msg)
+            page = [t for item in items if (t := Transaction.from_dict(item))]
+            transactions.extend(page)
+            if not page or not (isinstance(result, dict) and result.get("hasMore")):
+                break
+            after_id = max(t.transaction_id for t in page)
+        transactions.sort(key=lambda t: t.transaction_id)
+        return transactions
+
+    async def fetch_zones(self) -> list[Zone]:
+        """Fetch the parking zones and their tariffs, as the plan page loads them."""
+        return await self._with_session(self._fetch_zones)
+
+    async def _fetch_zones(self) -> list[Zone]:
+        url = f"{self._base_url}{ZONES_PATH}"
+        result = _decode_json(await self._get_json(url, {}))
+        items = result.get("zones") if isinstance(result, dict) else result
+        if not isinstance(items, list):
+            msg = "Onverwacht antwoord met parkeerzones."
+            raise ParkeeractieParseError(msg)
+        return [zone for item in items if (zone := Zone.from_payload(item))]
+
+    async def _get_json(self, url: str, params: dict[str, Any]) -> str:
+        headers = {
+            **HEADERS,
+            "Accept": "application/json",
+            "X-Requested-With": "XMLHttpRequest",
+        }
+        async with self._request("GET", url, headers=headers, params=params) as r:
+            body = await r.read()
+            self._trace.bytes_received += len(body)
+            return body.decode(r.charset or "utf-8", errors="replace")
+
+    def _capture(self, reason: str, html: str) -> None:
+        """Hand an unexpected page to the debug capture, labelled with the branch."""
+        if self._debug_capture is None:
+            _LOGGER.error("Unexpected page (%s); no debug capture configured", reason)
+            return
+        self._debug_capture(f"{self._trace.branch}_{reason}", html)
+
+    async def _async_parse_saldo_and_time(
+        self, raw_payload: str | None
+    ) -> AccountSnapshot:
+        """
+        Parse a customer payload, off the event loop if it is large.
+
+        Payloads of the usual size are decoded inline: handing them to a thread
+        costs more than decoding them. Larger ones go to a small shared pool,
+        in a copy of the current context so their parse time still counts
+        towards the trace of this refresh. The client never parses two payloads
+        at once (refreshes are single-flight), so its cache and that trace are
+        not touched from two threads together.
+        """
+        if raw_payload is None or len(raw_payload) < PARSE_OFFLOAD_SIZE:
+            return self._parse_saldo_and_time(raw_payload)
+        # run_in_executor neemt de context (en dus _TRACE) niet zelf mee
+        return await asyncio.get_running_loop().run_in_executor(
+            _parse_pool(),
+            functools.partial(
+                copy_context().run,
+                self._parse_saldo_and_time,
+                raw_payload,
+                on_loop=False,
+            ),
+        )
 
-        saldo = None
-        current_time = None
-        if payload:
-            if isinstance(payload.get("addItem"), dict):
-                add = payload["addItem"]
-
-                if isinstance(add.get("saldo"), (int, float)):
-                    saldo = float(add["saldo"])
-
-                # Look for time from addItem first (active session)
-                current_time = (
-                    add.get("timeRemaining")
-                    or add.get("currentTime")
-                    or add.get("remainingTime")
-                    or add.get("tijd")
-                    or add.get("tijdResterend")
-                    or add.get("restTime")
-                )
+    def _parse_saldo_and_time(
+        self, raw_payload: str | None, *, on_loop: bool = True
+    ) -> AccountSnapshot:
+        if raw_payload is None:
+            return AccountSnapshot()
+        start = time.perf_counter()
+        try:
+            # Ongewijzigde payload (meestal zo): niets opnieuw decoderen
+            key = hashlib.blake2b(raw_payload.encode(), digest_size=16).digest()
+            if (cached := self._parse_cache.get(key)) is not None:
+                self.stats.parse_cache_hits += 1
+                return cached
+            data = self._parse_payload(raw_payload)
+            self._parse_cache.put(key, data)
+            return data
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._trace.parse_ms += elapsed_ms
+            self._check_slow_parse(
+                "payload", elapsed_ms, len(raw_payload), on_loop=on_loop
+            )
+
+    def _check_slow_parse(
+        self, step: str, elapsed_ms: float, size: int, *, on_loop: bool
+    ) -> None:
+        if elapsed_ms < self.slow_parse_ms:
+            return
+        _LOGGER.warning(
+            "Parse step %s took %.1f ms for %d bytes%s",
+            step,
+            elapsed_ms,
+            size,
+            " on the event loop" if on_loop else "",
+        )
 
-                # If no active session time, check permit time balance
-                if current_time is None and isinstance(payload.get("permitList"), list):
-                    for permit in payload["permitList"]:
-                        if (
-                            isinstance(permit, dict)
-                            and permit.get("status") == "Active"
-                        ):
-                            time_balance = permit.get("timeBalance")
-                            if (
-                                isinstance(time_balance, (int, float))
-                                and time_balance > 0
-                            ):
-                                # Convert minutes to HH:MM:SS format
-                                minutes = int(time_balance)
-                                hours = minutes // 60
-                                remaining_minutes = minutes % 60
-                                current_time = f"{hours:02d}:{remaining_minutes:02d}:00"
-                                _LOGGER.debug(
-                                    "Using permit timeBalance: %d minutes -> %s",
-                                    time_balance,
-                                    current_time,
-                                )
-                                break
-
-                _LOGGER.debug("Selected current_time: %s", current_time)
-            else:
-                _LOGGER.debug(
-                    "No addItem found or not a dict. Payload keys: %s",
-                    list(payload.keys()) if isinstance(payload, dict) else "Not a dict",
-                )
-        return saldo, current_time
+    def _parse_payload(self, raw_payload: str) -> AccountSnapshot:
+        payload = None
+        try:
+            payload = _load_relaxed(raw_payload)
+        except (json.JSONDecodeError, UnicodeError) as e:
+            _LOGGER.debug("customerLayout.init payload parse error: %s", e)
+        return AccountSnapshot.from_payload(payload)
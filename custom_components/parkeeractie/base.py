@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -18,6 +19,7 @@ class BaseCoordinatorEntity(CoordinatorEntity[ParkeeractieCoordinator]):
     """Gedeelde basis voor alle Parkeeractie-entiteiten (device info, etc.)."""
 
     _attr_has_entity_name = True
+    _last_written: tuple[Any, ...] | None = None
 
     def __init__(
         self, coordinator: ParkeeractieCoordinator, entry: ConfigEntry
@@ -36,3 +38,26 @@ class BaseCoordinatorEntity(CoordinatorEntity[ParkeeractieCoordinator]):
     def entry_id(self) -> str:
         """Return the config entry ID."""
         return self._entry.entry_id
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.state, self.extra_state_attributes)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_changed_state()
+
+    @callback
+    def async_write_changed_state(self) -> None:
+        """
+        Write the state only if the value, attributes or availability changed.
+
+        Most polls return the same saldo and time; writing those anyway would
+        add a state row to the recorder and an event on the bus for nothing.
+        """
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._last_written:
+            self.coordinator.skipped_writes += 1
+            return
+        self._last_written = fingerprint
+        self.async_write_ha_state()
@@ -41,30 +41,15 @@ class ParkeerProbleemSensor(BaseCoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true if there is a parking problem."""
-        data = self.coordinator.data or {}
-        if not data:
+        if self.coordinator.data is None:
             return None  # vóór eerste refresh
-        saldo = data.get("saldo") or 0
-        current_time = data.get("current_time")
         # PROBLEEM indien: geen geld óf geen tijd (00:00:00 of None)
-        no_money = saldo <= 0
-        no_time = current_time in (None, "00:00:00")
-        return bool(no_money or no_time)
+        return self.coordinator.data.problem
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
-        d = self.coordinator.data or {}
-        return {
-            "saldo": d.get("saldo"),
-            "current_time": d.get("current_time"),
-            "reason": (
-                "geen_geld"
-                if (d.get("saldo") or 0) <= 0
-                else (
-                    "geen_tijd"
-                    if d.get("current_time") in (None, "00:00:00")
-                    else "geen"
-                )
-            ),
-        }
+        if self.coordinator.data is None:
+            return {}
+        # Saldo en tijd staan al in hun eigen sensoren
+        return {"reason": self.coordinator.data.problem_reason}
@@ -2,44 +2,69 @@
 
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
+from aiohttp import CookieJar
 from homeassistant import config_entries
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
-from .api import ParkeeractieClient
-from .const import DOMAIN
+from .api import (
+    ParkeeractieAuthError,
+    ParkeeractieCaptchaError,
+    ParkeeractieClient,
+    ParkeeractieConnectionError,
+    ParkeeractieError,
+)
+from .const import (
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_SLOW_PARSE_MS,
+    DATA_HANDOFF,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SLOW_PARSE_MS,
+    DOMAIN,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from homeassistant.data_entry_flow import FlowResult
 
 
+_LOGGER = logging.getLogger(__name__)
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Parkeeractie."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        _config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Return the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
         errors = {}
         if user_input is not None:
-            # Proeflogin
-            session = async_get_clientsession(self.hass)
-            client = ParkeeractieClient(
-                session, user_input["username"], user_input["password"]
-            )
-            try:
-                await client.login_and_fetch()
+            await self.async_set_unique_id(user_input["username"].strip().lower())
+            self._abort_if_unique_id_configured()
+            if error := await self._async_try_login(
+                user_input["username"], user_input["password"]
+            ):
+                errors["base"] = error
+            else:
                 return self.async_create_entry(title="Parkeeractie", data=user_input)
-            except (ValueError, RuntimeError) as e:
-                msg = str(e)
-                if "reCAPTCHA" in msg or "showCaptcha" in msg:
-                    errors["base"] = "captcha_required"
-                else:
-                    errors["base"] = "auth"
 
         schema = vol.Schema(
             {
@@ -48,3 +73,94 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+
+    async def async_step_reauth(self, _entry_data: Mapping[str, Any]) -> FlowResult:
+        """Start reauthentication after the server rejected the credentials."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for a new password."""
+        entry = self._get_reauth_entry()
+        errors = {}
+        if user_input is not None:
+            if error := await self._async_try_login(
+                entry.data["username"], user_input["password"]
+            ):
+                errors["base"] = error
+            else:
+                return self.async_update_reload_and_abort(
+                    entry, data_updates={"password": user_input["password"]}
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required("password"): str}),
+            description_placeholders={"username": entry.data["username"]},
+            errors=errors,
+        )
+
+    async def _async_try_login(self, username: str, password: str) -> str | None:
+        """
+        Log in once; return an error key for the form, or None on success.
+
+        On success the session cookies and the fetched account data are left in
+        ``hass.data`` for the entry being set up, so it does not log in again.
+        """
+        # Proeflogin, met een eigen cookie jar zoals de coordinator
+        session = async_create_clientsession(self.hass, cookie_jar=CookieJar())
+        client = ParkeeractieClient(session, username, password)
+        try:
+            snapshot = await client.login_and_fetch()
+        except ParkeeractieCaptchaError:
+            return "captcha_required"
+        except ParkeeractieAuthError:
+            return "auth"
+        except ParkeeractieConnectionError:
+            return "cannot_connect"
+        except ParkeeractieError:
+            _LOGGER.exception("Unexpected response while logging in")
+            return "unknown"
+        else:
+            self.hass.data.setdefault(DATA_HANDOFF, {})[username] = {
+                "cookies": client.export_cookies(),
+                "snapshot": snapshot,
+            }
+            return None
+        finally:
+            await session.close()
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the polling options of a Parkeeractie entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the poll interval bounds and the slow parse threshold."""
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MIN_INTERVAL,
+                    default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                vol.Required(
+                    CONF_MAX_INTERVAL,
+                    default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=1440)),
+                vol.Required(
+                    CONF_SLOW_PARSE_MS,
+                    default=options.get(CONF_SLOW_PARSE_MS, DEFAULT_SLOW_PARSE_MS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -6,6 +6,38 @@ LOGIN_URL = f"{BASE_URL}/"
 PLAN_URL = f"{BASE_URL}/Customer/PlanSession/Index/"
 
 DEFAULT_SCAN_INTERVAL = 300  # 5 min
+
+# Adaptief pollen (options flow, in minuten)
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+DEFAULT_MIN_INTERVAL = 1
+DEFAULT_MAX_INTERVAL = 240
+CONF_SLOW_PARSE_MS = "slow_parse_ms"  # options flow
+DEFAULT_SLOW_PARSE_MS = 20  # parse steps slower than this are logged
+EXPIRY_POLLS = 4  # polls spread over the remaining time of a running session
+LOW_SALDO_THRESHOLD = 5.0  # EUR; below this the poll interval does not back off
+MAX_CONCURRENT_LOGINS = 2  # across all config entries
+SCHEDULER_JITTER = 0.1  # +/- share of the poll interval
+RETRY_INTERVAL = 30  # s; first retry after a network error, doubling per failure
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+DATA_HANDOFF = f"{DOMAIN}_handoff"  # config flow -> setup, keyed by username
+STORAGE_VERSION = 1
+SESSION_SAVE_DELAY = 10  # s; bundles cookie updates of one refresh into one write
+SNAPSHOT_MAX_AGE = 86400  # s; older stored account data is not shown at startup
+DEBUG_CAPTURE_DIR = f"{DOMAIN}_debug"  # under the config directory, per entry
+DEBUG_CAPTURE_FILES = 5  # unexpected pages kept per entry, oldest dropped first
+DEBUG_CAPTURE_MAX_BYTES = 256 * 1024  # per page; longer pages are truncated
+DATA_HISTORY = f"{DOMAIN}_history"
+DATA_POOL = f"{DOMAIN}_pool"
+POOL_LIMIT = 20  # connections across all accounts
+POOL_LIMIT_PER_HOST = 6
+POOL_DNS_CACHE_TTL = 300  # s
+HISTORY_DB = f"{DOMAIN}_history.db"  # under the config directory, all accounts
+HISTORY_SYNC_INTERVAL = 3600  # s; also synced right after a session ends
+ZONE_CACHE_TTL = 7 * 86400  # s; zones and tariffs are fetched again after this
+ZONE_RETRY_INTERVAL = 3600  # s after a failed zone fetch
+RUNWAY_HORIZON = 7 * 86400  # s; saldo lasting longer than this is not computed
+STATISTICS_BATCH = 500  # hourly rows per call when importing into statistics
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
@@ -3,45 +3,527 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from aiohttp import CookieJar
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryError
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import ParkeeractieClient
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .api import (
+    ParkeeractieAuthError,
+    ParkeeractieCaptchaError,
+    ParkeeractieClient,
+    ParkeeractieConnectionError,
+    ParkeeractieError,
+)
+from .const import (
+    BASE_URL,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_SLOW_PARSE_MS,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_PARSE_MS,
+    DOMAIN,
+    EXPIRY_POLLS,
+    HISTORY_SYNC_INTERVAL,
+    LOW_SALDO_THRESHOLD,
+    RETRY_INTERVAL,
+    RUNWAY_HORIZON,
+    SESSION_SAVE_DELAY,
+    SNAPSHOT_MAX_AGE,
+    STORAGE_VERSION,
+    ZONE_CACHE_TTL,
+    ZONE_RETRY_INTERVAL,
+)
+from .debug_capture import DebugCaptureStore
+from .models import AccountSnapshot, Zone
+from .statistics import async_import_spend
 
 if TYPE_CHECKING:
+    import asyncio
+
+    from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
+    from .history import HistoryStore, SpendSummary
+    from .http_pool import ParkeeractieConnectionPool
+
 _LOGGER = logging.getLogger(__name__)
 
 
-class ParkeeractieCoordinator(DataUpdateCoordinator):
+def compute_poll_interval(
+    data: AccountSnapshot,
+    unchanged_polls: int,
+    min_interval: float,
+    max_interval: float,
+) -> float:
+    """
+    Return the seconds until the next poll for freshly fetched data.
+
+    * running session: ``EXPIRY_POLLS`` polls over the remaining time, so the
+      interval shrinks to ``min_interval`` towards expiry;
+    * low saldo: the default interval, without backing off;
+    * otherwise idle: the default interval doubled for every poll that returned
+      the same data, up to ``max_interval``.
+    """
+    base = min(max(DEFAULT_SCAN_INTERVAL, min_interval), max_interval)
+    secs = data.remaining_seconds
+    if data.session_active and secs is not None:
+        return max(min(secs / EXPIRY_POLLS, base), min_interval)
+    if (saldo := data.saldo) is not None and saldo <= LOW_SALDO_THRESHOLD:
+        return base
+    return min(base * 2 ** min(unchanged_polls, 16), max_interval)
+
+
+def compute_retry_interval(
+    failures: int, max_interval: float, *, transient: bool
+) -> float:
+    """
+    Return the seconds until the next attempt after consecutive failed polls.
+
+    Network and server errors are retried quickly, starting at ``RETRY_INTERVAL``;
+    other errors (unexpected pages) start at the default interval. Both double per
+    failure up to ``max_interval``. The scheduler adds its jitter on top, so
+    accounts that failed together do not retry together.
+    """
+    first = RETRY_INTERVAL if transient else DEFAULT_SCAN_INTERVAL
+    return min(first * 2 ** min(failures - 1, 16), max(max_interval, first))
+
+
+class ParkeeractieCoordinator(DataUpdateCoordinator[AccountSnapshot]):
     """Coordinator to manage Parkeeractie data updates."""
 
-    def __init__(self, hass: HomeAssistant, username: str, password: str) -> None:
-        """Initialize the coordinator."""
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        base_url: str = BASE_URL,
+        login_limiter: asyncio.Semaphore | None = None,
+        history: HistoryStore | None = None,
+        pool: ParkeeractieConnectionPool | None = None,
+    ) -> None:
+        """
+        Initialize the coordinator.
+
+        There is no update interval: ParkeeractieScheduler decides when to poll,
+        using ``poll_interval`` and ``urgency``. Without a ``pool`` the account
+        gets a session on Home Assistant's shared connector.
+        """
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=entry,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=None,
+        )
+        # Eigen cookie jar per account, zodat de sessie niet gedeeld wordt met
+        # andere integraties en los opgeslagen kan worden.
+        if pool is not None:
+            self._http = pool.async_create_session()
+        else:
+            self._http = async_create_clientsession(hass, cookie_jar=CookieJar())
+        self.debug_capture = DebugCaptureStore(hass, entry.entry_id)
+        self._client = ParkeeractieClient(
+            self._http,
+            entry.data["username"],
+            entry.data["password"],
+            base_url,
+            login_limiter,
+            debug_capture=self.debug_capture.async_capture,
+            slow_parse_ms=self._slow_parse_option(),
+        )
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
         )
-        session = async_get_clientsession(hass)
-        self._client = ParkeeractieClient(session, username, password)
+        self._poll_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        self._unchanged_polls = 0
+        self._fetched_at = time.monotonic()
+        self._snapshot_changed = False
+        self.stale = False  # data restored from storage, not yet refreshed
+        self.skipped_writes = 0  # entity state writes skipped as unchanged
+        self._failures = 0
+        self._breaker: str | None = None  # why logins are paused, if they are
+        self.history = history
+        self.spend: SpendSummary | None = None
+        self._history_synced: float | None = None
+        self._history_task: asyncio.Task[None] | None = None
+        self._history_warned = False  # failed sync logged as a warning
+        self.zones: dict[str, Zone] = {}
+        self._zones_fetched_at: float | None = None  # epoch
+        self._zones_attempt: float | None = None  # monotonic
+        self._zones_warned = False  # failed fetch logged as a warning
+        self._session_seen: float | None = None  # epoch; start if the page has none
 
     @property
     def client(self) -> ParkeeractieClient:
         """Return the API client."""
         return self._client
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    @property
+    def poll_interval(self) -> timedelta:
+        """Return how long the scheduler should wait before the next poll."""
+        return self._poll_interval
+
+    @property
+    def urgency(self) -> float:
+        """
+        Return a sort key for polls that are due together; lowest goes first.
+
+        Accounts without data come first, then those with the least time left.
+        """
+        if self.data is None:
+            return 0
+        if (saldo := self.data.saldo) is not None and saldo <= 0:
+            return 1
+        secs = self.data.remaining_seconds
+        return float("inf") if secs is None else 1 + secs
+
+    @property
+    def breaker(self) -> str | None:
+        """Return why logins are paused ("auth" or "captcha"), or None."""
+        return self._breaker
+
+    @property
+    def _issue_id(self) -> str:
+        return f"captcha_{self.config_entry.entry_id}"
+
+    @callback
+    def async_reset_breaker(self) -> None:
+        """Allow logging in again, after the user solved the captcha."""
+        self._breaker = None
+        self._failures = 0
+        ir.async_delete_issue(self.hass, DOMAIN, self._issue_id)
+
+    def _open_breaker(self, reason: str) -> None:
+        """
+        Stop logging in until the user intervenes.
+
+        Every further failed login makes a captcha more likely, so polls do not
+        touch the server while the breaker is open.
+        """
+        _LOGGER.warning("Logins for %s paused: %s", self.config_entry.title, reason)
+        self._breaker = reason
+        self._poll_interval = timedelta(minutes=self._interval_options()[1])
+        if reason == "captcha":
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                self._issue_id,
+                data={"entry_id": self.config_entry.entry_id},
+                is_fixable=True,
+                severity=ir.IssueSeverity.ERROR,
+                translation_key="captcha_required",
+                translation_placeholders={"title": self.config_entry.title},
+            )
+
+    def _interval_options(self) -> tuple[int, int]:
+        """Return the (min, max) poll interval options, in minutes."""
+        options = self.config_entry.options
+        return (
+            options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+            options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+        )
+
+    def _slow_parse_option(self) -> int:
+        """Return the slow parse warning threshold option, in milliseconds."""
+        return self.config_entry.options.get(CONF_SLOW_PARSE_MS, DEFAULT_SLOW_PARSE_MS)
+
+    async def async_load_session(self) -> bool:
+        """
+        Restore the stored session cookies and the last known account data.
+
+        Returns True if account data was restored. It is published right away,
+        marked ``stale`` until the next successful refresh, so setup does not
+        have to wait for the site.
+        """
+        if not (data := await self._store.async_load()):
+            return False
+        self._client.import_cookies(data.get("cookies", []))
+        if zones := data.get("zones"):
+            self.zones = {z["zone_code"]: Zone.from_dict(z) for z in zones}
+            self._zones_fetched_at = data.get("zones_fetched_at")
+        snapshot, fetched_at = data.get("snapshot"), data.get("fetched_at")
+        if snapshot is None or fetched_at is None:
+            return False
+        age = time.time() - fetched_at
+        if not 0 <= age <= SNAPSHOT_MAX_AGE:
+            return False
+        # Aftellen loopt door vanaf het moment van ophalen, niet vanaf nu
+        self._fetched_at = time.monotonic() - age
+        self.stale = True
+        self.async_set_updated_data(AccountSnapshot.from_dict(snapshot))
+        _LOGGER.debug("Restored account data from %.0f s ago", age)
+        return True
+
+    @callback
+    def async_adopt_session(
+        self, cookies: list[dict[str, Any]], snapshot: AccountSnapshot
+    ) -> None:
+        """Take over the session and data the config flow just logged in with."""
+        self._client.import_cookies(cookies)
+        self._fetched_at = time.monotonic()
+        self._snapshot_changed = True
+        # Eerst het interval: na het publiceren telt de snapshot als ongewijzigd
+        self._update_poll_interval(snapshot)
+        self.async_set_updated_data(snapshot)
+        self._store.async_delay_save(self._data_to_store, SESSION_SAVE_DELAY)
+
+    def _data_to_store(self) -> dict[str, Any]:
+        self._snapshot_changed = False
+        stored: dict[str, Any] = {"cookies": self._client.export_cookies()}
+        if self.data is not None:
+            stored["snapshot"] = self.data.as_dict()
+            stored["fetched_at"] = time.time() - (time.monotonic() - self._fetched_at)
+        if self.zones:
+            stored["zones"] = [zone.as_dict() for zone in self.zones.values()]
+            stored["zones_fetched_at"] = self._zones_fetched_at
+        return stored
+
+    async def async_shutdown(self) -> None:
+        """Persist the session and close the dedicated HTTP session."""
+        await super().async_shutdown()
+        if self._client.cookies_changed or self._snapshot_changed:
+            await self._store.async_save(self._data_to_store())
+        await self._http.close()
+
+    def remaining_seconds(self) -> int | None:
+        """
+        Return the remaining time, counted down locally for a running session.
+
+        The server value is only as fresh as the last poll; while a session runs
+        the time elapsed since that fetch is subtracted, so entities can show an
+        accurate value between polls without extra requests.
+        """
+        if self.data is None:
+            return None
+        secs = self.data.remaining_seconds
+        if secs is None or not self.data.session_active:
+            return secs
+        return max(secs - int(time.monotonic() - self._fetched_at), 0)
+
+    @property
+    def _account(self) -> str:
+        return self.config_entry.unique_id or self.config_entry.entry_id
+
+    @callback
+    def _async_schedule_history_sync(self, data: AccountSnapshot) -> None:
+        """
+        Sync the parking history in the background when it may have changed.
+
+        That is once per ``HISTORY_SYNC_INTERVAL`` and right after a session
+        ended; the poll itself does not wait for it.
+        """
+        if self.history is None or (
+            self._history_task is not None and not self._history_task.done()
+        ):
+            return
+        ended = self.data is not None and self.data.session_active
+        ended = ended and not data.session_active
+        if (
+            not ended
+            and self._history_synced is not None
+            and time.monotonic() - self._history_synced < HISTORY_SYNC_INTERVAL
+        ):
+            return
+        self._history_task = self.config_entry.async_create_background_task(
+            self.hass, self._async_sync_history(self.history), f"{DOMAIN} history sync"
+        )
+
+    async def _async_sync_history(self, history: HistoryStore) -> None:
+        if self.spend is None:
+            # Eerst uit de lokale database, maar alleen als daar al iets in staat:
+            # zonder ooit gelukte sync blijven de sensoren onbekend, niet 0
+            spend = await history.async_spend(self._account)
+            if spend.transactions:
+                self._async_set_spend(spend)
+        self._history_synced = time.monotonic()
+        try:
+            last_id = await history.async_last_id(self._account)
+            transactions = await self._client.fetch_transactions(last_id)
+        except ParkeeractieError as err:
+            # Het endpoint is niet tegen de echte site gecontroleerd: één keer
+            # waarschuwen, daarna alleen debug tot een sync weer lukt
+            if self._history_warned:
+                _LOGGER.debug("Parking history sync failed: %s", err)
+            else:
+                _LOGGER.warning(
+                    "Could not sync the parking history of %s: %s",
+                    self.config_entry.title,
+                    err,
+                )
+                self._history_warned = True
+            return
+        self._history_warned = False
+        since = None
+        if transactions:
+            added = await history.async_add(self._account, transactions)
+            _LOGGER.debug("Stored %d new parking transactions", added)
+            since = min(t.start for t in transactions).timestamp()
+        self._async_set_spend(await history.async_spend(self._account))
+        await async_import_spend(self.hass, history, self.config_entry, since)
+
+    @callback
+    def _async_schedule_zone_fetch(self) -> None:
+        """Fetch zones and tariffs in the background once they are out of date."""
+        now = time.monotonic()
+        if (
+            self._zones_fetched_at is not None
+            and time.time() - self._zones_fetched_at < ZONE_CACHE_TTL
+        ) or (
+            self._zones_attempt is not None
+            and now - self._zones_attempt < ZONE_RETRY_INTERVAL
+        ):
+            return
+        self._zones_attempt = now
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_fetch_zones(), f"{DOMAIN} zone fetch"
+        )
+
+    async def _async_fetch_zones(self) -> None:
+        try:
+            zones = await self._client.fetch_zones()
+        except ParkeeractieError as err:
+            # Net als de historie niet gecontroleerd; één keer waarschuwen
+            if self._zones_warned:
+                _LOGGER.debug("Fetching zones and tariffs failed: %s", err)
+            else:
+                _LOGGER.warning(
+                    "Could not fetch the zones and tariffs of %s: %s",
+                    self.config_entry.title,
+                    err,
+                )
+                self._zones_warned = True
+            return
+        self._zones_warned = False
+        _LOGGER.debug("Fetched %d zones with tariffs", len(zones))
+        self.zones = {zone.zone_code: zone for zone in zones}
+        self._zones_fetched_at = time.time()
+        self._store.async_delay_save(self._data_to_store, SESSION_SAVE_DELAY)
+        self.async_update_listeners()
+
+    def zone(self) -> Zone | None:
+        """Return the zone of the running session, else of the active permit."""
+        if self.data is None:
+            return None
+        codes = [p.zone_code for p in self.data.permits if p.active]
+        if self.data.session is not None:
+            codes.insert(0, self.data.session.zone_code)
+        return next((self.zones[c] for c in codes if c in self.zones), None)
+
+    def _session_start(self) -> float | None:
+        if self.data is None or self.data.session is None:
+            return None
+        if (started := self.data.session.started) is not None:
+            return started.timestamp()
+        return self._session_seen
+
+    def session_cost(self) -> tuple[float, float] | None:
+        """
+        Return the (so far, expected total) cost of the running session.
+
+        Computed from the cached tariffs, the start of the session and its
+        locally counted down remaining time, so it needs no requests.
+        """
+        zone, start = self.zone(), self._session_start()
+        if zone is None or start is None:
+            return None
+        now = time.time()
+        end = now + (self.remaining_seconds() or 0)
+        return zone.cost(start, now), zone.cost(start, end)
+
+    def saldo_runway(self) -> float | None:
+        """
+        Return the seconds of parking the saldo still pays for, from now.
+
+        The saldo is charged when a session ends, so the costs of a running
+        session so far are subtracted first. None without tariffs, or if the
+        saldo lasts beyond ``RUNWAY_HORIZON``.
+        """
+        if self.data is None or self.data.saldo is None:
+            return None
+        if (zone := self.zone()) is None:
+            return None
+        budget = self.data.saldo
+        if (cost := self.session_cost()) is not None:
+            budget -= cost[0]
+        return zone.runway(time.time(), budget, RUNWAY_HORIZON)
+
+    @callback
+    def _async_set_spend(self, spend: SpendSummary) -> None:
+        if spend != self.spend:
+            self.spend = spend
+            self.async_update_listeners()
+
+    def _update_poll_interval(self, data: AccountSnapshot) -> None:
+        if data == self.data:
+            self._unchanged_polls += 1
+        else:
+            self._unchanged_polls = 0
+        min_interval, max_interval = self._interval_options()
+        seconds = compute_poll_interval(
+            data, self._unchanged_polls, min_interval * 60, max_interval * 60
+        )
+        self._poll_interval = timedelta(seconds=seconds)
+        _LOGGER.debug(
+            "Poll interval %s (%d unchanged polls)",
+            self._poll_interval,
+            self._unchanged_polls,
+        )
+
+    def _update_retry_interval(self, err: Exception) -> None:
+        self._failures += 1
+        seconds = compute_retry_interval(
+            self._failures,
+            self._interval_options()[1] * 60,
+            transient=isinstance(err, ParkeeractieConnectionError),
+        )
+        self._poll_interval = timedelta(seconds=seconds)
+        _LOGGER.debug(
+            "Retry in %s (%d consecutive failures)", self._poll_interval, self._failures
+        )
+
+    async def _async_update_data(self) -> AccountSnapshot:
         """Fetch data from API endpoint."""
+        if self._breaker is not None:
+            msg = f"Inloggen gepauzeerd ({self._breaker}); los eerst de melding op."
+            raise UpdateFailed(msg)
+        # Net als de intervallen geldt een gewijzigde optie vanaf de volgende poll
+        self._client.slow_parse_ms = self._slow_parse_option()
         try:
-            saldo, current_time = await self._client.login_and_fetch()
+            data = await self._client.login_and_fetch()
+        except ParkeeractieAuthError as err:
+            # Start de reauth-flow; na nieuwe gegevens wordt de entry herladen
+            self._open_breaker("auth")
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except ParkeeractieCaptchaError as err:
+            self._open_breaker("captcha")
+            raise ConfigEntryError(str(err)) from err
         except Exception as err:
+            self._update_retry_interval(err)
             raise UpdateFailed(str(err)) from err
         else:
-            return {"saldo": saldo, "current_time": current_time}
+            self._failures = 0
+            self._fetched_at = time.monotonic()
+            # Lopende sessie: opslaan voor het aftellen na een herstart
+            if data != self.data or data.session_active:
+                self._snapshot_changed = True
+            self.stale = False
+            if not data.session_active:
+                self._session_seen = None
+            elif self._session_seen is None:
+                self._session_seen = time.time()
+            self._async_schedule_history_sync(data)
+            self._async_schedule_zone_fetch()
+            self._update_poll_interval(data)
+            return data
+        finally:
+            if self._client.cookies_changed or self._snapshot_changed:
+                self._store.async_delay_save(self._data_to_store, SESSION_SAVE_DELAY)
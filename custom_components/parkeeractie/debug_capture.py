@@ -0,0 +1,91 @@
+"""Bounded on-disk store for pages the client could not understand."""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .const import DEBUG_CAPTURE_DIR, DEBUG_CAPTURE_FILES, DEBUG_CAPTURE_MAX_BYTES
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DebugCaptureStore:
+    """
+    Keep the last few unexpected pages of one config entry on disk.
+
+    Captures are written from the executor, so a failing login never blocks the
+    event loop. Files live under the Home Assistant config directory, are only
+    readable by the owner and are named after their UTC timestamp and label; the
+    oldest are removed once there are more than ``max_files``.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        max_files: int = DEBUG_CAPTURE_FILES,
+        max_bytes: int = DEBUG_CAPTURE_MAX_BYTES,
+    ) -> None:
+        """Initialize the store for a config entry."""
+        self.hass = hass
+        self.directory = Path(hass.config.path(DEBUG_CAPTURE_DIR, entry_id))
+        self._max_files = max_files
+        self._max_bytes = max_bytes
+
+    @callback
+    def async_capture(self, label: str, html: str) -> None:
+        """Schedule writing a page to disk."""
+        name = f"{datetime.now(UTC):%Y%m%dT%H%M%S.%fZ}_{label}.html"
+        data = html.encode("utf-8")[: self._max_bytes]
+        self.hass.async_add_executor_job(self._write, name, data)
+
+    def _write(self, name: str, data: bytes) -> None:
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            path = self.directory / name
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # Oudste captures opruimen
+            for old in sorted(self.directory.glob("*.html"))[: -self._max_files]:
+                old.unlink(missing_ok=True)
+        except OSError:
+            _LOGGER.exception("Kon debug HTML niet schrijven")
+        else:
+            _LOGGER.error(
+                "Onverwachte pagina opgeslagen naar %s (ook in de diagnostics)", path
+            )
+
+    async def async_get_captures(self) -> list[dict[str, Any]]:
+        """Return the stored captures, oldest first."""
+        return await self.hass.async_add_executor_job(self._read_all)
+
+    def _read_all(self) -> list[dict[str, Any]]:
+        if not self.directory.is_dir():
+            return []
+        return [
+            {
+                "file": path.name,
+                "size": path.stat().st_size,
+                "html": path.read_bytes().decode("utf-8", errors="replace"),
+            }
+            for path in sorted(self.directory.glob("*.html"))
+        ]
+
+    async def async_remove(self) -> None:
+        """Delete all captures of the entry."""
+        await self.hass.async_add_executor_job(
+            shutil.rmtree,
+            self.directory,
+            True,  # noqa: FBT003
+        )
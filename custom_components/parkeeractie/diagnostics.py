@@ -0,0 +1,111 @@
+"""Diagnostics support for Parkeeractie."""
+
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+
+from .api import TRACE_METRICS
+from .const import DOMAIN
+from .extract import CSRF_FIELD
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import ParkeeractieCoordinator
+    from .models import AccountSnapshot
+
+TO_REDACT = {
+    "username",
+    "password",
+    "unique_id",
+    "name",
+    "license_plate",
+    "license_plates",
+}
+
+_TOKEN_INPUT_RE = re.compile(rf"<input\b[^>]*{CSRF_FIELD}[^>]*>", re.IGNORECASE)
+_VALUE_ATTR_RE = re.compile(
+    r"(\bvalue\s*=\s*)(\"[^\"]*\"|'[^']*'|[^\s>]+)", re.IGNORECASE
+)
+# "name" in de payloads, ook HTML- of backslash-geëscapet; dekt de accountnaam
+_NAME_FIELD_RE = re.compile(
+    r'((?:&quot;|\\?")name(?:&quot;|\\?")\s*:\s*)(&quot;|\\?").*?\2'
+)
+
+
+def _page_secrets(username: str, data: AccountSnapshot | None) -> list[str]:
+    """Return the account values to strip from captured pages, longest first."""
+    values = {username}
+    if data is not None:
+        if data.session is not None and data.session.license_plate:
+            values.add(data.session.license_plate)
+        for permit in data.permits:
+            values.update(permit.license_plates)
+            if permit.name:
+                values.add(permit.name)
+    # Ook zoals ze in de (HTML-geëscapete) payload of zonder streepjes staan
+    variants = set()
+    for value in values:
+        variants.update((value, html.escape(value), value.replace("-", "")))
+    return sorted((v for v in variants if v), key=len, reverse=True)
+
+
+def _redact_page(text: str, secrets: list[str]) -> str:
+    """Strip account values, names and anti-forgery tokens from a captured page."""
+    for secret in secrets:
+        text = text.replace(secret, REDACTED)
+    text = _NAME_FIELD_RE.sub(
+        lambda field: f"{field.group(1)}{field.group(2)}{REDACTED}{field.group(2)}",
+        text,
+    )
+    return _TOKEN_INPUT_RE.sub(
+        lambda tag: _VALUE_ATTR_RE.sub(
+            lambda attr: f'{attr.group(1)}"{REDACTED}"', tag.group(0)
+        ),
+        text,
+    )
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: ParkeeractieCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    stats = client.stats
+    data = coordinator.data
+    secrets = _page_secrets(entry.data["username"], data)
+    captures = await coordinator.debug_capture.async_get_captures()
+    for capture in captures:
+        capture["html"] = _redact_page(capture["html"], secrets)
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "data": None if data is None else async_redact_data(data.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "poll_interval": coordinator.poll_interval.total_seconds(),
+            "breaker": coordinator.breaker,
+            "stale": coordinator.stale,
+            "skipped_writes": coordinator.skipped_writes,
+            "session_expires": client.session_expires,
+            "zones": sorted(coordinator.zones),
+        },
+        "stats": {
+            "refreshes": stats.refreshes,
+            "logins": stats.logins,
+            "round_trips": stats.round_trips,
+            "last_login": stats.last_login,
+            "parse_cache_hits": stats.parse_cache_hits,
+            "coalesced": stats.coalesced,
+            "branches": stats.branches,
+        },
+        "rolling": {metric: stats.summary(metric) for metric in TRACE_METRICS},
+        "recent_refreshes": [asdict(trace) for trace in stats.history],
+        "debug_captures": captures,
+    }
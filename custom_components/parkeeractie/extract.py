@@ -0,0 +1,174 @@
+"""Single-pass extraction of the CSRF token and script payloads from a page."""
+
+from __future__ import annotations
+
+import html as ihtml
+import re
+from dataclasses import dataclass
+
+CSRF_FIELD = "__RequestVerificationToken"
+_LOGIN_MARKER = "login.init("
+_CUSTOMER_MARKER = "customerLayout.init("
+_MARKERS = (CSRF_FIELD, _LOGIN_MARKER, _CUSTOMER_MARKER)
+
+_value_attr_re = re.compile(r"""\bvalue\s*=\s*(?:(["'])(?P<q>.*?)\1|(?P<u>[^\s>]+))""")
+_WHITESPACE = " \t\r\n\f\v"
+
+
+@dataclass(frozen=True, slots=True)
+class PageData:
+    """The pieces of a Parkeeractie page the client cares about."""
+
+    token: str | None = None
+    login_payload: str | None = None
+    customer_payload: str | None = None
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _string_argument(text: str, pos: int) -> tuple[str | None, int]:
+    """
+    Read a quoted string argument that closes the call, e.g. ``"..." );``.
+
+    ``pos`` points just after the opening parenthesis (or comma). Returns the raw
+    payload (escapes untouched) and the position after the ``;``, or ``None`` and
+    ``pos`` if the call is not (yet) closed.
+    """
+    start = _skip_ws(text, pos)
+    if start >= len(text) or text[start] not in "'\"":
+        return None, pos
+    closing = text[start] + ")"
+    search = start + 2  # payload is at least one character
+    while (end := text.find(closing, search)) != -1:
+        after = _skip_ws(text, end + 2)
+        if after < len(text) and text[after] == ";":
+            return text[start + 1 : end], after + 1
+        search = end + 1
+    return None, pos
+
+
+def _input_value(text: str, pos: int) -> str | None:
+    """Return the value attribute of the ``<input>`` tag around ``pos``."""
+    tag_start = text.rfind("<", 0, pos)
+    tag_end = text.find(">", pos)
+    if tag_start == -1 or tag_end == -1:
+        return None
+    tag = text[tag_start:tag_end]
+    if tag[1:6].lower() != "input" or ">" in tag:
+        return None
+    if not (m := _value_attr_re.search(tag)):
+        return None
+    value = m.group("q") if m.group("q") is not None else m.group("u")
+    return ihtml.unescape(value) or None
+
+
+def extract_page(text: str) -> PageData:
+    """
+    Find the CSRF token, ``login.init`` and ``customerLayout.init`` payloads.
+
+    Walks the page once from start to end, jumping from marker to marker, and
+    stops as soon as all three are found. No DOM tree is built. Each marker has
+    its own forward-only ``str.find`` cursor, which is much faster than a regex
+    alternation that has to try every branch at every offset.
+    """
+    found: dict[str, str | None] = dict.fromkeys(_MARKERS)
+    next_at = {marker: text.find(marker) for marker in _MARKERS}
+    pos = 0
+    while pending := [m for m in _MARKERS if found[m] is None and next_at[m] != -1]:
+        marker = min(pending, key=next_at.__getitem__)
+        at = next_at[marker]
+        pos = max(pos, at + len(marker))
+        if marker == CSRF_FIELD:
+            found[marker] = _input_value(text, at)
+        elif marker == _LOGIN_MARKER:
+            found[marker], pos = _string_argument(text, pos)
+        else:
+            # customerLayout.init(<id>, "<payload>");
+            comma = text.find(",", pos)
+            if comma > pos:
+                payload, end = _string_argument(text, comma + 1)
+                if payload is not None:
+                    found[marker], pos = payload, end
+        if found[marker] is None:
+            next_at[marker] = text.find(marker, at + len(marker))
+    return PageData(found[CSRF_FIELD], found[_LOGIN_MARKER], found[_CUSTOMER_MARKER])
+
+
+class PageScanner:
+    """
+    Look for the payloads while a page is still being downloaded.
+
+    Feed decoded text as it arrives. ``feed`` returns True once the page holds
+    everything the client needs: a closed ``customerLayout.init(...)`` call, or a
+    closed ``login.init(...)`` call plus the CSRF token. The rest of the body can
+    then be skipped. Each marker keeps its own cursor, so text that was already
+    searched is not searched again.
+    """
+
+    def __init__(self) -> None:
+        """Start with an empty page."""
+        self._text = ""
+        self._found: dict[str, str | None] = dict.fromkeys(_MARKERS)
+        self._search_from = dict.fromkeys(_MARKERS, 0)
+
+    @property
+    def text(self) -> str:
+        """Return the text received so far."""
+        return self._text
+
+    @property
+    def complete(self) -> bool:
+        """Return True if the rest of the page is not needed."""
+        found = self._found
+        return found[_CUSTOMER_MARKER] is not None or (
+            found[_LOGIN_MARKER] is not None and found[CSRF_FIELD] is not None
+        )
+
+    def feed(self, chunk: str) -> bool:
+        """Add a chunk of text and return True once the page is complete."""
+        self._text += chunk
+        for marker in _MARKERS:
+            if self._found[marker] is None:
+                self._scan(marker)
+        return self.complete
+
+    def _scan(self, marker: str) -> None:
+        text = self._text
+        start = self._search_from[marker]
+        while (at := text.find(marker, start)) != -1:
+            if marker == CSRF_FIELD:
+                if text.find(">", at) == -1:
+                    break  # tag not complete yet
+                value = _input_value(text, at)
+            elif marker == _LOGIN_MARKER:
+                value, _ = _string_argument(text, at + len(marker))
+                if value is None:
+                    break  # call not closed yet
+            else:
+                comma = text.find(",", at + len(marker))
+                value = None
+                if comma != -1:
+                    value, _ = _string_argument(text, comma + 1)
+                if value is None:
+                    break  # call not closed yet
+            if value is not None:
+                self._found[marker] = value
+                return
+            start = at + len(marker)
+        else:
+            # Marker may straddle the chunk boundary: retry its possible start
+            at = max(len(text) - len(marker) + 1, start)
+        self._search_from[marker] = at
+
+    def result(self) -> PageData:
+        """Return what was found; scans the whole text if the page is incomplete."""
+        if not self.complete:
+            return extract_page(self._text)
+        found = self._found
+        return PageData(
+            found[CSRF_FIELD], found[_LOGIN_MARKER], found[_CUSTOMER_MARKER]
+        )
@@ -0,0 +1,199 @@
+"""Local SQLite store for the parking history of all accounts."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+from .const import HISTORY_DB
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import date, datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .models import Transaction
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS transactions (
+        account TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        start_ts REAL NOT NULL,
+        end_ts REAL,
+        zone TEXT,
+        plate TEXT,
+        cost REAL NOT NULL,
+        PRIMARY KEY (account, id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS transactions_start ON transactions (account, start_ts)",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SpendSummary:
+    """Parking costs of one account, by local day and month, as of ``day``."""
+
+    day: date
+    today: float = 0.0
+    month: float = 0.0
+    zones: dict[str, float] = field(default_factory=dict)  # this month, per zone
+    transactions: int = 0
+
+
+class HistoryStore:
+    """
+    Parking transactions of all accounts in one indexed SQLite database.
+
+    Syncs only ask the server for transactions newer than :meth:`async_last_id`,
+    and the spend sensors are answered from the index on ``(account, start_ts)``,
+    so the history is downloaded once instead of on every poll. SQLite calls block,
+    so they all run in the executor; one connection is shared behind a lock.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store; the database is opened on first use."""
+        self.hass = hass
+        self.path = hass.config.path(HISTORY_DB)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                for statement in _SCHEMA:
+                    self._conn.execute(statement)
+        return self._conn
+
+    async def async_last_id(self, account: str) -> int | None:
+        """Return the newest stored transaction id of an account."""
+        return await self.hass.async_add_executor_job(self._last_id, account)
+
+    def _last_id(self, account: str) -> int | None:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT MAX(id) FROM transactions WHERE account = ?", (account,)
+                )
+                .fetchone()
+            )
+        return row[0]
+
+    async def async_add(self, account: str, transactions: Iterable[Transaction]) -> int:
+        """Store new transactions, ignoring known ids; return how many were new."""
+        rows = [
+            (
+                account,
+                t.transaction_id,
+                t.start.timestamp(),
+                t.end.timestamp() if t.end else None,
+                t.zone_code,
+                t.license_plate,
+                t.cost,
+            )
+            for t in transactions
+        ]
+        return await self.hass.async_add_executor_job(self._add, rows)
+
+    def _add(self, rows: list[tuple]) -> int:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.executemany(
+                    "INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return cursor.rowcount
+
+    async def async_spend(self, account: str) -> SpendSummary:
+        """Return the spend of an account today and this month, local time."""
+        today = dt_util.start_of_local_day()
+        return await self.hass.async_add_executor_job(
+            self._spend, account, today, today.replace(day=1)
+        )
+
+    def _spend(self, account: str, today: datetime, month: datetime) -> SpendSummary:
+        month_ts = month.timestamp()
+        with self._lock:
+            conn = self._connection()
+            spent_today, spent_month, count = conn.execute(
+                "SELECT TOTAL(CASE WHEN start_ts >= ? THEN cost END), TOTAL(cost), "
+                "(SELECT COUNT(*) FROM transactions WHERE account = ?) "
+                "FROM transactions WHERE account = ? AND start_ts >= ?",
+                (today.timestamp(), account, account, month_ts),
+            ).fetchone()
+            # Ook zones zonder kosten deze maand, zodat hun sensor op 0 gaat
+            zones = conn.execute(
+                "SELECT zone, TOTAL(CASE WHEN start_ts >= ? THEN cost END) "
+                "FROM transactions WHERE account = ? AND zone IS NOT NULL "
+                "GROUP BY zone",
+                (month_ts, account),
+            ).fetchall()
+        return SpendSummary(
+            day=today.date(),
+            today=round(spent_today, 2),
+            month=round(spent_month, 2),
+            zones={zone: round(cost, 2) for zone, cost in zones},
+            transactions=count,
+        )
+
+    async def async_hourly(
+        self, account: str, since: float
+    ) -> tuple[float, list[tuple[float, float]]]:
+        """
+        Return the costs before ``since`` and the costs per UTC hour after it.
+
+        Hours are those in which the sessions started; hours without sessions are
+        left out. ``since`` is a timestamp at the start of an hour.
+        """
+        return await self.hass.async_add_executor_job(self._hourly, account, since)
+
+    def _hourly(
+        self, account: str, since: float
+    ) -> tuple[float, list[tuple[float, float]]]:
+        with self._lock:
+            conn = self._connection()
+            (before,) = conn.execute(
+                "SELECT TOTAL(cost) FROM transactions "
+                "WHERE account = ? AND start_ts < ?",
+                (account, since),
+            ).fetchone()
+            hours = conn.execute(
+                "SELECT CAST(start_ts / 3600 AS INTEGER) * 3600.0 AS hour, "
+                "TOTAL(cost) FROM transactions WHERE account = ? AND start_ts >= ? "
+                "GROUP BY hour ORDER BY hour",
+                (account, since),
+            ).fetchall()
+        return before, hours
+
+    async def async_remove_account(self, account: str) -> None:
+        """Delete the history of an account."""
+        await self.hass.async_add_executor_job(self._remove_account, account)
+
+    def _remove_account(self, account: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM transactions WHERE account = ?", (account,))
+
+    async def async_close(self) -> None:
+        """Close the database connection."""
+        await self.hass.async_add_executor_job(self._close)
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        _LOGGER.debug("Closed parking history database")
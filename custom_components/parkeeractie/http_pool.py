@@ -0,0 +1,75 @@
+"""HTTP connection pool shared by the Parkeeractie accounts."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientSession, ClientTimeout, CookieJar, TCPConnector
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import callback
+from homeassistant.util.ssl import get_default_context
+
+from .const import (
+    POOL_DNS_CACHE_TTL,
+    POOL_LIMIT,
+    POOL_LIMIT_PER_HOST,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Vangnet; de client geeft elk verzoek een eigen, kortere timeout
+SESSION_TIMEOUT = ClientTimeout(total=60)
+
+
+class ParkeeractieConnectionPool:
+    """
+    Connections to the Parkeeractie site, shared by all accounts.
+
+    Each account gets its own session (and with it its own cookie jar) on this
+    connector, so sessions stay separate while requests made back to back, such
+    as a login or the history sync after a poll, can reuse a connection. Polls
+    are minutes apart, longer than aiohttp keeps an idle connection, so they
+    usually open a new one. DNS answers are cached. The connector belongs to the
+    pool: closing a session leaves it open, and the pool is closed when the last
+    entry unloads or Home Assistant stops.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create the connector."""
+        self._connector = TCPConnector(
+            limit=POOL_LIMIT,
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=POOL_DNS_CACHE_TTL,
+            ssl=get_default_context(),
+        )
+        self._unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_close_at_stop
+        )
+
+    @callback
+    def async_create_session(self) -> ClientSession:
+        """Return a new session on the shared connector, with its own cookies."""
+        # aiohttp vraagt zelf om gzip/deflate en pakt het antwoord uit
+        return ClientSession(
+            connector=self._connector,
+            connector_owner=False,
+            cookie_jar=CookieJar(),
+            timeout=SESSION_TIMEOUT,
+        )
+
+    async def _async_close_at_stop(self, _event: Event) -> None:
+        self._unsub_close = None
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close all pooled connections."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        if not self._connector.closed:
+            await self._connector.close()
+            _LOGGER.debug("Closed the Parkeeractie connection pool")
@@ -0,0 +1,413 @@
+"""Typed account snapshot, parsed once per refresh, and history and zone data."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+_LOGGER = logging.getLogger(__name__)
+
+TIME_FORMAT_PARTS = 3  # Expected number of parts in HH:MM:SS format
+
+# addItem keys that may hold the remaining time of a running session
+_SESSION_TIME_KEYS = (
+    "timeRemaining",
+    "currentTime",
+    "remainingTime",
+    "tijd",
+    "tijdResterend",
+    "restTime",
+)
+
+REASON_NO_MONEY = "geen_geld"
+REASON_NO_TIME = "geen_tijd"
+REASON_NONE = "geen"
+
+# Tijden zonder tijdzone van de parkeerapp zijn Nederlandse tijd
+LOCAL_TZ = ZoneInfo("Europe/Amsterdam")
+
+
+def hhmmss_to_seconds(raw: str | None) -> int | None:
+    """Convert HH:MM:SS string to seconds."""
+    if not isinstance(raw, str) or raw.count(":") != TIME_FORMAT_PARTS - 1:
+        return None
+    try:
+        h, m, s = (int(x) for x in raw.split(":"))
+        return h * 3600 + m * 60 + s
+    except (ValueError, TypeError):
+        return None
+
+
+def _minutes_to_hhmmss(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
+
+def _parse_time(raw: Any) -> datetime | None:
+    if not isinstance(raw, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=LOCAL_TZ)
+
+
+@dataclass(frozen=True, slots=True)
+class Permit:
+    """A parking permit from the ``permitList`` of the customer page."""
+
+    permit_id: int | str | None
+    name: str | None
+    status: str | None
+    time_balance: int | None  # minutes
+    zone_code: str | None
+    license_plates: tuple[str, ...]
+
+    @property
+    def active(self) -> bool:
+        """Return True if the permit is active."""
+        return self.status == "Active"
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> Permit:
+        """Build a permit from its payload dict."""
+        balance = raw.get("timeBalance")
+        plates = raw.get("licensePlates")
+        return cls(
+            permit_id=raw.get("permitId"),
+            name=raw.get("name"),
+            status=raw.get("status"),
+            time_balance=int(balance) if isinstance(balance, (int, float)) else None,
+            zone_code=raw.get("zoneCode"),
+            license_plates=tuple(p for p in plates if isinstance(p, str))
+            if isinstance(plates, list)
+            else (),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ActiveSession:
+    """A running parking session, as announced in ``addItem``."""
+
+    time_remaining: str
+    license_plate: str | None = None
+    zone_code: str | None = None
+    start_time: str | None = None
+    end_time: str | None = None
+
+    @property
+    def started(self) -> datetime | None:
+        """Return when the session started, if the page said so."""
+        return _parse_time(self.start_time)
+
+
+@dataclass(frozen=True, slots=True)
+class AccountSnapshot:
+    """
+    Everything the entities need from one customer page, computed once.
+
+    ``current_time`` is the HH:MM:SS value shown for the account: the remaining
+    time of the running session, else the time balance of the first active
+    permit. Derived values (``remaining_seconds``, ``problem_reason``) are filled
+    in by :meth:`from_payload` so entities never re-derive them.
+    """
+
+    saldo: float | None = None
+    current_time: str | None = None
+    remaining_seconds: int | None = None
+    session: ActiveSession | None = None
+    permits: tuple[Permit, ...] = ()
+    problem_reason: str = REASON_NONE
+
+    @property
+    def found(self) -> bool:
+        """Return True if the page was a customer page with account data."""
+        return self.saldo is not None or self.current_time is not None
+
+    @property
+    def session_active(self) -> bool:
+        """Return True if a parking session is running."""
+        return self.session is not None
+
+    @property
+    def problem(self) -> bool:
+        """Return True if there is no money or no time left."""
+        return self.problem_reason != REASON_NONE
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot as JSON-style dicts and lists, for storage."""
+        data = asdict(self)
+        # asdict laat tuples staan; redactie en JSON verwachten lijsten
+        data["permits"] = [
+            {**permit, "license_plates": list(permit["license_plates"])}
+            for permit in data["permits"]
+        ]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> AccountSnapshot:
+        """Rebuild a snapshot stored with :meth:`as_dict`."""
+        session = data.get("session")
+        return cls(
+            saldo=data.get("saldo"),
+            current_time=data.get("current_time"),
+            remaining_seconds=data.get("remaining_seconds"),
+            session=ActiveSession(**session) if session else None,
+            permits=tuple(
+                Permit(**{**p, "license_plates": tuple(p["license_plates"])})
+                for p in data.get("permits", ())
+            ),
+            problem_reason=data.get("problem_reason", REASON_NONE),
+        )
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> AccountSnapshot:
+        """Build a snapshot from a decoded ``customerLayout.init`` payload."""
+        if not isinstance(payload, dict) or not isinstance(
+            payload.get("addItem"), dict
+        ):
+            _LOGGER.debug(
+                "No addItem found or not a dict. Payload keys: %s",
+                list(payload.keys()) if isinstance(payload, dict) else "Not a dict",
+            )
+            return cls()
+        add = payload["addItem"]
+
+        saldo = None
+        if isinstance(add.get("saldo"), (int, float)):
+            saldo = float(add["saldo"])
+
+        permits = tuple(
+            Permit.from_dict(p)
+            for p in payload.get("permitList") or ()
+            if isinstance(p, dict)
+        )
+
+        # Look for time from addItem first (active session)
+        current_time = next(
+            (add[key] for key in _SESSION_TIME_KEYS if add.get(key)), None
+        )
+        session = None
+        if current_time is not None:
+            session = ActiveSession(
+                time_remaining=current_time,
+                license_plate=add.get("licensePlate"),
+                zone_code=add.get("zoneCode"),
+                start_time=add.get("startTime"),
+                end_time=add.get("endTime"),
+            )
+        else:
+            # If no active session time, check permit time balance
+            for permit in permits:
+                if permit.active and permit.time_balance and permit.time_balance > 0:
+                    current_time = _minutes_to_hhmmss(permit.time_balance)
+                    _LOGGER.debug(
+                        "Using permit timeBalance: %d minutes -> %s",
+                        permit.time_balance,
+                        current_time,
+                    )
+                    break
+        _LOGGER.debug("Selected current_time: %s", current_time)
+
+        if (saldo or 0) <= 0:
+            reason = REASON_NO_MONEY
+        elif current_time in (None, "00:00:00"):
+            reason = REASON_NO_TIME
+        else:
+            reason = REASON_NONE
+
+        return cls(
+            saldo=saldo,
+            current_time=current_time,
+            remaining_seconds=hhmmss_to_seconds(current_time),
+            session=session,
+            permits=permits,
+            problem_reason=reason,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Transaction:
+    """A finished parking session from the account history."""
+
+    transaction_id: int
+    start: datetime
+    end: datetime | None
+    license_plate: str | None
+    zone_code: str | None
+    cost: float
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> Transaction | None:
+        """Build a transaction from its payload dict, or None if incomplete."""
+        if not isinstance(raw, dict):
+            return None
+        tid = raw.get("id")
+        start = _parse_time(raw.get("startTime"))
+        cost = raw.get("cost")
+        if not isinstance(tid, int) or start is None:
+            _LOGGER.debug("Skipping incomplete transaction: %s", raw)
+            return None
+        return cls(
+            transaction_id=tid,
+            start=start,
+            end=_parse_time(raw.get("endTime")),
+            license_plate=raw.get("licensePlate"),
+            zone_code=raw.get("zoneCode"),
+            cost=float(cost) if isinstance(cost, (int, float)) else 0.0,
+        )
+
+
+def _hhmm_to_minutes(raw: Any) -> int | None:
+    if not isinstance(raw, str) or raw.count(":") != 1:
+        return None
+    try:
+        h, m = (int(x) for x in raw.split(":"))
+    except ValueError:
+        return None
+    return h * 60 + m
+
+
+@dataclass(frozen=True, slots=True)
+class Tariff:
+    """Hourly price of a zone during part of some weekdays, local time."""
+
+    days: tuple[int, ...]  # 0 is Monday
+    start_minute: int  # since local midnight
+    end_minute: int  # exclusive; 1440 is midnight at the end of the day
+    price_per_hour: float
+
+    @classmethod
+    def from_payload(cls, raw: Any) -> Tariff | None:
+        """Build a tariff from the zone data of the plan page, or None."""
+        if not isinstance(raw, dict):
+            return None
+        start = _hhmm_to_minutes(raw.get("start"))
+        end = _hhmm_to_minutes(raw.get("end"))
+        price = raw.get("pricePerHour")
+        days = raw.get("days")
+        if (
+            start is None
+            or end is None
+            or not isinstance(price, (int, float))
+            or not isinstance(days, list)
+        ):
+            _LOGGER.debug("Skipping incomplete tariff: %s", raw)
+            return None
+        return cls(
+            days=tuple(d for d in days if isinstance(d, int)),
+            start_minute=start,
+            end_minute=end,
+            price_per_hour=float(price),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Zone:
+    """
+    A parking zone and its tariffs, for computing costs without the server.
+
+    Times are timestamps; the tariffs apply to Dutch local time, so costs are
+    summed per stretch of constant price between tariff boundaries.
+    """
+
+    zone_code: str
+    name: str | None
+    tariffs: tuple[Tariff, ...]
+
+    def _tariffs_on(self, local: datetime) -> list[Tariff]:
+        return [t for t in self.tariffs if local.weekday() in t.days]
+
+    def price_at(self, ts: float) -> float:
+        """Return the hourly price at a moment; 0 outside the paid hours."""
+        local = datetime.fromtimestamp(ts, LOCAL_TZ)
+        minute = local.hour * 60 + local.minute
+        return next(
+            (
+                t.price_per_hour
+                for t in self._tariffs_on(local)
+                if t.start_minute <= minute < t.end_minute
+            ),
+            0.0,
+        )
+
+    def _next_change(self, ts: float) -> float:
+        """Return the first tariff boundary after ``ts``, at most next midnight."""
+        local = datetime.fromtimestamp(ts, LOCAL_TZ)
+        midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+        minute = local.hour * 60 + local.minute
+        bounds = {1440}
+        for tariff in self._tariffs_on(local):
+            bounds.update((tariff.start_minute, tariff.end_minute))
+        nxt = min(b for b in bounds if b > minute)
+        if nxt >= 1440:  # noqa: PLR2004
+            day = midnight + timedelta(days=1)
+        else:
+            day = midnight.replace(hour=nxt // 60, minute=nxt % 60)
+        # Rond zomer-/wintertijd kan de wandklok terugspringen; dan een minuut
+        # vooruit, maar een grens vlak na ``ts`` nooit overslaan
+        day_ts = day.timestamp()
+        return day_ts if day_ts > ts else ts + 60
+
+    def cost(self, start: float, end: float) -> float:
+        """Return what parking from ``start`` until ``end`` costs."""
+        total = 0.0
+        ts = start
+        while ts < end:
+            nxt = min(self._next_change(ts), end)
+            total += self.price_at(ts) * (nxt - ts) / 3600
+            ts = nxt
+        return total
+
+    def runway(self, start: float, budget: float, horizon: float) -> float | None:
+        """
+        Return the seconds of parking ``budget`` pays for, from ``start``.
+
+        Free hours on the way are included. None if it lasts beyond ``horizon``
+        seconds, e.g. in a zone that is free most of the time.
+        """
+        budget = max(budget, 0.0)
+        ts = start
+        while ts - start < horizon:
+            nxt = self._next_change(ts)
+            price = self.price_at(ts)
+            stretch = price * (nxt - ts) / 3600
+            if price > 0 and stretch >= budget:
+                return ts + budget / price * 3600 - start
+            budget -= stretch
+            ts = nxt
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the zone as JSON-serialisable dicts, for storage."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Zone:
+        """Rebuild a zone stored with :meth:`as_dict`."""
+        return cls(
+            zone_code=data["zone_code"],
+            name=data.get("name"),
+            tariffs=tuple(
+                Tariff(**{**t, "days": tuple(t["days"])}) for t in data["tariffs"]
+            ),
+        )
+
+    @classmethod
+    def from_payload(cls, raw: Any) -> Zone | None:
+        """Build a zone from the zone data of the plan page, or None."""
+        if not isinstance(raw, dict) or not isinstance(raw.get("zoneCode"), str):
+            return None
+        tariffs = raw.get("tariffs")
+        return cls(
+            zone_code=raw["zoneCode"],
+            name=raw.get("name"),
+            tariffs=tuple(
+                t
+                for item in (tariffs if isinstance(tariffs, list) else ())
+                if (t := Tariff.from_payload(item))
+            ),
+        )
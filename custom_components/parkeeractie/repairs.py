@@ -0,0 +1,53 @@
+"""Repair flows for Parkeeractie."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.repairs import RepairsFlow
+
+from .const import DATA_SCHEDULER, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.data_entry_flow import FlowResult
+
+    from .coordinator import ParkeeractieCoordinator
+
+
+class CaptchaRepairFlow(RepairsFlow):
+    """Resume logging in once the user solved the captcha on the website."""
+
+    def __init__(self, entry_id: str) -> None:
+        """Initialize the flow for a config entry."""
+        self._entry_id = entry_id
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the first step."""
+        return await self.async_step_confirm(user_input)
+
+    async def async_step_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Close the circuit breaker and poll again."""
+        if user_input is not None:
+            coordinator: ParkeeractieCoordinator | None = self.hass.data.get(
+                DOMAIN, {}
+            ).get(self._entry_id)
+            if coordinator is None:
+                # Setup is mislukt op de captcha: opnieuw opzetten
+                self.hass.config_entries.async_schedule_reload(self._entry_id)
+            else:
+                coordinator.async_reset_breaker()
+                self.hass.data[DATA_SCHEDULER].async_poll_now(self._entry_id)
+            return self.async_create_entry(data={})
+        return self.async_show_form(step_id="confirm")
+
+
+async def async_create_fix_flow(
+    _hass: HomeAssistant, _issue_id: str, data: dict[str, Any] | None
+) -> RepairsFlow:
+    """Create a fix flow for a Parkeeractie issue."""
+    return CaptchaRepairFlow(str((data or {}).get("entry_id", "")))
@@ -0,0 +1,150 @@
+"""Shared poll scheduler for all Parkeeractie config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from itertools import pairwise
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import MAX_CONCURRENT_LOGINS, SCHEDULER_JITTER
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .coordinator import ParkeeractieCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_DUE_SLACK = 1.0  # s; entries due this soon run in the same batch
+_MIN_FIRST_DELAY = 0.25  # share of the interval before the first scheduled poll
+
+
+class ParkeeractieScheduler:
+    """
+    Own the polling of every config entry.
+
+    Coordinators are created without an update interval; the scheduler keeps one
+    due time per entry and a single timer for the earliest one. New entries are
+    placed in the largest gap of the poll cycle and every reschedule adds jitter,
+    so accounts do not poll (and log in) in lockstep. Entries that are due at the
+    same time run most urgent first, and ``login_limiter`` caps how many of them
+    post the login form at once.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, max_concurrent_logins: int = MAX_CONCURRENT_LOGINS
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.login_limiter = asyncio.Semaphore(max_concurrent_logins)
+        self._coordinators: dict[str, ParkeeractieCoordinator] = {}
+        self._due: dict[str, float] = {}
+        self._running: set[str] = set()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._job = HassJob(self._async_fire, "parkeeractie scheduler")
+
+    @property
+    def entry_ids(self) -> list[str]:
+        """Return the entry IDs being polled."""
+        return list(self._coordinators)
+
+    @callback
+    def async_add(self, entry_id: str, coordinator: ParkeeractieCoordinator) -> None:
+        """Start polling a coordinator that just did its first refresh."""
+        self._coordinators[entry_id] = coordinator
+        self._due[entry_id] = self._free_slot(coordinator.poll_interval.total_seconds())
+        self._async_schedule_timer()
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Stop polling a coordinator."""
+        self._coordinators.pop(entry_id, None)
+        self._due.pop(entry_id, None)
+        self._async_schedule_timer()
+
+    @callback
+    def async_poll_now(self, entry_id: str) -> None:
+        """Poll an entry as soon as possible, instead of at its due time."""
+        if entry_id in self._coordinators:
+            self._due[entry_id] = time.monotonic()
+            self._async_schedule_timer()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    def _free_slot(self, interval: float) -> float:
+        """Return the middle of the largest gap between due times in one interval."""
+        now = time.monotonic()
+        others = sorted(
+            (due - now) % interval
+            for entry_id, due in self._due.items()
+            if entry_id in self._coordinators
+        )
+        if not others:
+            return now + interval
+        gaps = [
+            (others[0] + interval - others[-1], others[-1]),
+            *((b - a, a) for a, b in pairwise(others)),
+        ]
+        size, start = max(gaps)
+        offset = (start + size / 2) % interval
+        # Net ververst bij setup: niet meteen opnieuw pollen
+        if offset < interval * _MIN_FIRST_DELAY:
+            offset += interval
+        return now + offset
+
+    @callback
+    def _async_schedule_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        pending = [
+            due for entry_id, due in self._due.items() if entry_id not in self._running
+        ]
+        if not pending:
+            return
+        delay = max(min(pending) - time.monotonic(), 0)
+        self._unsub_timer = async_call_later(self.hass, delay, self._job)
+
+    @callback
+    def _async_fire(self, _now: object) -> None:
+        self._unsub_timer = None
+        horizon = time.monotonic() + _DUE_SLACK
+        due = [
+            entry_id
+            for entry_id, when in self._due.items()
+            if when <= horizon and entry_id not in self._running
+        ]
+        # Meest urgente eerst: die krijgen als eerste een login-slot
+        due.sort(key=lambda entry_id: self._coordinators[entry_id].urgency)
+        for entry_id in due:
+            self._running.add(entry_id)
+            self.hass.async_create_background_task(
+                self._async_poll(entry_id), f"parkeeractie poll {entry_id}"
+            )
+        self._async_schedule_timer()
+
+    async def _async_poll(self, entry_id: str) -> None:
+        try:
+            if coordinator := self._coordinators.get(entry_id):
+                await coordinator.async_refresh()
+        finally:
+            self._running.discard(entry_id)
+            if coordinator := self._coordinators.get(entry_id):
+                interval = coordinator.poll_interval.total_seconds()
+                jitter = random.uniform(-SCHEDULER_JITTER, SCHEDULER_JITTER)  # noqa: S311
+                self._due[entry_id] = time.monotonic() + interval * (1 + jitter)
+                _LOGGER.debug(
+                    "Next poll for %s in %.0f s", entry_id, interval * (1 + jitter)
+                )
+            self._async_schedule_timer()
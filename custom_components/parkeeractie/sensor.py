@@ -4,29 +4,30 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
-from homeassistant.const import UnitOfTime
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.event import (
+    async_track_time_change,
+    async_track_utc_time_change,
+)
+from homeassistant.util import dt as dt_util
 
 from .base import BaseCoordinatorEntity
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-# Constants
-TIME_FORMAT_PARTS = 3  # Expected number of parts in HH:MM:SS format
-
-
-def _hhmmss_to_seconds(raw: str | None) -> int | None:
-    """Convert HH:MM:SS string to seconds."""
-    if not isinstance(raw, str) or raw.count(":") != TIME_FORMAT_PARTS - 1:
-        return None
-    try:
-        h, m, s = (int(x) for x in raw.split(":"))
-        return h * 3600 + m * 60 + s
-    except (ValueError, TypeError):
-        return None
+    from .coordinator import ParkeeractieCoordinator
+    from .history import SpendSummary
 
 
 async def async_setup_entry(
@@ -40,15 +41,38 @@ async def async_setup_entry(
         [
             SaldoSensor(coordinator, entry),
             TimeRemainingSensor(coordinator, entry),
+            SessionCostSensor(coordinator, entry),
+            SaldoRunwaySensor(coordinator, entry),
+            SpendTodaySensor(coordinator, entry),
+            SpendMonthSensor(coordinator, entry),
+            RoundTripsSensor(coordinator, entry),
+            RefreshDurationSensor(coordinator, entry),
+            BytesReceivedSensor(coordinator, entry),
         ]
     )
 
+    # Een sensor per zone, zodra die in de parkeerhistorie voorkomt
+    zones: set[str] = set()
+
+    @callback
+    def _async_add_zone_sensors() -> None:
+        if coordinator.spend is None:
+            return
+        new = [zone for zone in coordinator.spend.zones if zone not in zones]
+        zones.update(new)
+        if new:
+            add_entities(ZoneSpendSensor(coordinator, entry, zone) for zone in new)
+
+    _async_add_zone_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_zone_sensors))
+
 
 class SaldoSensor(BaseCoordinatorEntity, SensorEntity):
     """Sensor showing parking account balance."""
 
     _attr_name = "Saldo"
     _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
     _attr_native_unit_of_measurement = "EUR"
     _attr_suggested_display_precision = 2
 
@@ -60,16 +84,40 @@ class SaldoSensor(BaseCoordinatorEntity, SensorEntity):
     @property
     def native_value(self) -> float | None:
         """Return the current balance."""
-        return self.coordinator.data.get("saldo")
+        return self.coordinator.data.saldo
+
+
+class TickingSensor(BaseCoordinatorEntity, SensorEntity):
+    """Base for sensors computed locally that change every minute."""
+
+    # Alleen tijdens een lopende sessie, tenzij de waarde ook anders verloopt
+    _tick_without_session = False
 
+    async def async_added_to_hass(self) -> None:
+        """Recompute locally every minute."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_utc_time_change(self.hass, self._async_tick, second=0)
+        )
 
-class TimeRemainingSensor(BaseCoordinatorEntity, SensorEntity):
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        # Geen HTTP-verkeer: alleen de lokale berekening bijwerken
+        data = self.coordinator.data
+        if data and (data.session_active or self._tick_without_session):
+            self.async_write_changed_state()
+
+
+class TimeRemainingSensor(TickingSensor):
     """Sensor showing remaining parking time."""
 
     _attr_name = "Tijd resterend"
     _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTime.HOURS
     _attr_icon = "mdi:timer-outline"
+    # Volgt uit de state; niet bij elke state-rij opnieuw opslaan
+    _unrecorded_attributes = frozenset({"raw", "time_applicable"})
 
     @property
     def unique_id(self) -> str:
@@ -79,8 +127,7 @@ class TimeRemainingSensor(BaseCoordinatorEntity, SensorEntity):
     @property
     def native_value(self) -> float | None:
         """Return remaining time in hours."""
-        raw = self.coordinator.data.get("current_time")
-        secs = _hhmmss_to_seconds(raw)
+        secs = self.coordinator.remaining_seconds()
         # Als tijd n.v.t. is, rapporteer 0 uren (en attribuut geeft n.v.t. aan)
         if secs is None:
             return 0
@@ -90,13 +137,315 @@ class TimeRemainingSensor(BaseCoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
-        raw = self.coordinator.data.get("current_time")
-        secs = _hhmmss_to_seconds(raw)
-        not_applicable = secs is None
-        if not_applicable:
-            secs = 0
+        data = self.coordinator.data
+        raw = data.current_time
         return {
             "raw": raw or "00:00:00",
-            "time_applicable": not not_applicable,
-            "display_format": raw or "00:00:00",
+            "time_applicable": data.remaining_seconds is not None,
+        }
+
+
+class SessionCostSensor(TickingSensor):
+    """Sensor with the costs of the running session, from the cached tariffs."""
+
+    _attr_name = "Kosten lopende sessie"
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_native_unit_of_measurement = "EUR"
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:cash-fast"
+    _unrecorded_attributes = frozenset({"expected_total", "price_per_hour", "zone"})
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this sensor."""
+        return f"{self.entry_id}_session_cost"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the costs of the running session so far; 0 without one."""
+        if not self.coordinator.data.session_active:
+            return 0.0
+        cost = self.coordinator.session_cost()
+        return None if cost is None else round(cost[0], 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the expected total and the current price of the session."""
+        cost = self.coordinator.session_cost()
+        if cost is None or (zone := self.coordinator.zone()) is None:
+            return {}
+        return {
+            "expected_total": round(cost[1], 2),
+            "price_per_hour": zone.price_at(dt_util.utcnow().timestamp()),
+            "zone": zone.zone_code,
+        }
+
+
+class SaldoRunwaySensor(TickingSensor):
+    """Sensor with how long the saldo pays for parking, from the cached tariffs."""
+
+    _attr_name = "Saldo toereikend voor"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 1
+    _attr_icon = "mdi:timer-sand-complete"
+    _unrecorded_attributes = frozenset({"zone"})
+    # Loopt ook zonder sessie, zodra gratis uren voorbij zijn
+    _tick_without_session = True
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this sensor."""
+        return f"{self.entry_id}_saldo_runway"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the hours of parking the saldo pays for, from now."""
+        secs = self.coordinator.saldo_runway()
+        return None if secs is None else round(secs / 3600, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the zone the runway is computed for."""
+        zone = self.coordinator.zone()
+        return {} if zone is None else {"zone": zone.zone_code}
+
+
+class SpendSensor(BaseCoordinatorEntity, SensorEntity):
+    """Base for the parking costs computed from the local history."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_native_unit_of_measurement = "EUR"
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:cash-clock"
+
+    async def async_added_to_hass(self) -> None:
+        """Go back to 0 at local midnight, without waiting for the next sync."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_midnight, hour=0, minute=0, second=0
+            )
+        )
+
+    @callback
+    def _async_midnight(self, _now: datetime) -> None:
+        self.async_write_changed_state()
+
+    def _period_start(self) -> datetime:
+        """Return the local start of the period the costs are summed over."""
+        return dt_util.start_of_local_day().replace(day=1)
+
+    @property
+    def last_reset(self) -> datetime:
+        """Return when the total last went back to 0."""
+        return self._period_start()
+
+    def _current(self, spend: SpendSummary, value: float) -> float:
+        """Return ``value`` if ``spend`` is of the current period, else 0."""
+        return value if spend.day >= self._period_start().date() else 0.0
+
+
+class SpendTodaySensor(SpendSensor):
+    """Sensor with the parking costs of today."""
+
+    _attr_name = "Uitgaven vandaag"
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this sensor."""
+        return f"{self.entry_id}_spend_today"
+
+    def _period_start(self) -> datetime:
+        return dt_util.start_of_local_day()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the costs of the sessions started today."""
+        spend = self.coordinator.spend
+        return None if spend is None else self._current(spend, spend.today)
+
+
+class SpendMonthSensor(SpendSensor):
+    """Sensor with the parking costs of this month."""
+
+    _attr_name = "Uitgaven deze maand"
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this sensor."""
+        return f"{self.entry_id}_spend_month"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the costs of the sessions started this month."""
+        spend = self.coordinator.spend
+        return None if spend is None else self._current(spend, spend.month)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of transactions in the local history."""
+        spend = self.coordinator.spend
+        return {} if spend is None else {"transactions": spend.transactions}
+
+
+class ZoneSpendSensor(SpendSensor):
+    """Sensor with the parking costs of this month in one zone."""
+
+    def __init__(
+        self, coordinator: ParkeeractieCoordinator, entry: ConfigEntry, zone: str
+    ) -> None:
+        """Initialize the sensor for a zone."""
+        super().__init__(coordinator, entry)
+        self._zone = zone
+        self._attr_name = f"Uitgaven deze maand zone {zone}"
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this sensor."""
+        return f"{self.entry_id}_spend_month_zone_{self._zone}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the costs of the sessions started this month in the zone."""
+        spend = self.coordinator.spend
+        return (
+            None
+            if spend is None
+            else self._current(spend, spend.zones.get(self._zone, 0.0))
+        )
+
+
+class RoundTripsSensor(BaseCoordinatorEntity, SensorEntity):
+    """Diagnostic sensor with the HTTP round trips of the last refresh."""
+
+    _attr_name = "Verzoeken laatste verversing"
+    _attr_icon = "mdi:swap-horizontal"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset(
+        {
+            "refreshes",
+            "logins",
+            "round_trips_total",
+            "last_login",
+            "session_expires",
+            "skipped_writes",
+            "coalesced",
+        }
+    )
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this sensor."""
+        return f"{self.entry_id}_round_trips"
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of round trips used by the last refresh."""
+        return self.coordinator.client.stats.last_round_trips
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return cumulative refresh and login counters."""
+        stats = self.coordinator.client.stats
+        return {
+            "refreshes": stats.refreshes,
+            "logins": stats.logins,
+            "round_trips_total": stats.round_trips,
+            "last_login": stats.last_login,
+            "session_expires": self.coordinator.client.session_expires,
+            "skipped_writes": self.coordinator.skipped_writes,
+            "coalesced": stats.coalesced,
+        }
+
+
+class RefreshDurationSensor(BaseCoordinatorEntity, SensorEntity):
+    """Diagnostic sensor with the duration of the last refresh, per phase."""
+
+    _attr_name = "Duur laatste verversing"
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset(
+        {
+            "branch",
+            "get_ms",
+            "post_ms",
+            "login_wait_ms",
+            "parse_ms",
+            "redirects",
+            "total_ms_rolling",
+            "get_ms_rolling",
+            "post_ms_rolling",
+            "parse_ms_rolling",
+            "branches",
+        }
+    )
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this sensor."""
+        return f"{self.entry_id}_refresh_duration"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last refresh."""
+        trace = self.coordinator.client.stats.last_trace
+        return None if trace is None else round(trace.total_ms, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the phases of the last refresh and rolling percentiles."""
+        stats = self.coordinator.client.stats
+        if (trace := stats.last_trace) is None:
+            return {}
+        return {
+            "branch": trace.branch,
+            "get_ms": round(trace.get_ms, 1),
+            "post_ms": round(trace.post_ms, 1),
+            "login_wait_ms": round(trace.login_wait_ms, 1),
+            "parse_ms": round(trace.parse_ms, 2),
+            "redirects": trace.redirects,
+            "total_ms_rolling": stats.summary("total_ms"),
+            "get_ms_rolling": stats.summary("get_ms"),
+            "post_ms_rolling": stats.summary("post_ms"),
+            "parse_ms_rolling": stats.summary("parse_ms"),
+            "branches": dict(stats.branches),
         }
+
+
+class BytesReceivedSensor(BaseCoordinatorEntity, SensorEntity):
+    """Diagnostic sensor with the response bytes read by the last refresh."""
+
+    _attr_name = "Ontvangen data laatste verversing"
+    _attr_icon = "mdi:download-network-outline"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({"rolling"})
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this sensor."""
+        return f"{self.entry_id}_bytes_received"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the bytes received by the last refresh."""
+        trace = self.coordinator.client.stats.last_trace
+        return None if trace is None else trace.bytes_received
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return rolling percentiles of the bytes received per refresh."""
+        return {"rolling": self.coordinator.client.stats.summary("bytes_received")}
@@ -0,0 +1,103 @@
+"""Import the parking history into Home Assistant long-term statistics."""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import callback
+from homeassistant.util import slugify
+
+from .const import DOMAIN, STATISTICS_BATCH
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .history import HistoryStore
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+
+def spend_statistic_id(entry_id: str) -> str:
+    """Return the external statistic id of the parking costs of an entry."""
+    # Op entry-id, niet op het e-mailadres van het account
+    return f"{DOMAIN}:spend_{slugify(entry_id)}"
+
+
+async def async_import_spend(
+    hass: HomeAssistant,
+    history: HistoryStore,
+    entry: ConfigEntry,
+    since: float | None = None,
+) -> int:
+    """
+    Add the hourly parking costs of an entry to the external statistics.
+
+    Starts after the last hour already imported, or at ``since`` (the start of
+    the oldest newly synced transaction) if that is earlier, since a session is
+    only synced once it has ended. Hours are recomputed from the local history,
+    running sum included, and the recorder overwrites rows it already has, so
+    repeated imports never duplicate. Returns the number of hours written.
+    """
+    account = entry.unique_id or entry.entry_id
+    statistic_id = spend_statistic_id(entry.entry_id)
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics,
+        hass,
+        1,
+        statistic_id,
+        True,  # noqa: FBT003
+        {"sum"},
+    )
+    start = 0.0
+    if rows := last.get(statistic_id):
+        start = rows[0]["start"] + HOUR
+        if since is not None:
+            start = min(start, since // HOUR * HOUR)
+    total, hours = await history.async_hourly(account, start)
+    if not hours:
+        return 0
+
+    metadata = StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f"Parkeerkosten {entry.title}",
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement="EUR",
+    )
+    statistics: list[StatisticData] = []
+    for hour, cost in hours:
+        total += cost
+        statistics.append(
+            StatisticData(
+                start=datetime.fromtimestamp(hour, UTC),
+                state=round(cost, 2),
+                sum=round(total, 2),
+            )
+        )
+    # Weinig, grote aanroepen: elke aanroep is een eigen taak in de recorder
+    for i in range(0, len(statistics), STATISTICS_BATCH):
+        async_add_external_statistics(
+            hass, metadata, statistics[i : i + STATISTICS_BATCH]
+        )
+    _LOGGER.debug(
+        "Imported %d hours of parking costs into %s", len(hours), statistic_id
+    )
+    return len(hours)
+
+
+@callback
+def async_clear_spend(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the imported parking costs of an entry."""
+    get_instance(hass).async_clear_statistics([spend_statistic_id(entry_id)])
@@ -0,0 +1,89 @@
+"""PageScanner must find the same payloads as extract_page, however it is fed."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from custom_components.parkeeractie.extract import PageData, PageScanner, extract_page
+
+FIXTURES = Path(__file__).parents[1] / "benchmarks" / "fixtures"
+PAGES = ("customer_page.html", "login_page.html", "captcha_page.html")
+
+# Kleine pagina's waarin elke splitsing een marker, escape of tag doorsnijdt
+LOGIN_PAGE = (
+    "<html><body><form>"
+    '<input name="__RequestVerificationToken" type="hidden" value="tok&amp;en-1" />'
+    "</form><script>"
+    'login.init( "{&quot;showCaptcha&quot;:false,&quot;x&quot;:&quot;a)b&quot;}") ;'
+    "</script></body></html>"
+)
+CUSTOMER_PAGE = (
+    "<html><script>"
+    "customerLayout.init(100001, "
+    '"{\\"saldo\\":1.5,\\"note\\":\\"\\")\\" ,\\"x\\":1}");'
+    "</script><p>rest</p></html>"
+)
+# Eerst een aanroep zonder string-argument; de tweede telt
+REPEATED_PAGE = (
+    "login.init(settings); "
+    '<input value="v1" name="__RequestVerificationToken">'
+    'login.init("{}");'
+)
+
+
+def _scan(text: str, size: int) -> PageData:
+    """Feed ``text`` in chunks of ``size`` the way the client does."""
+    scanner = PageScanner()
+    for start in range(0, len(text), size):
+        if scanner.feed(text[start : start + size]):
+            break
+    else:
+        scanner.feed("")
+    return scanner.result()
+
+
+def _scan_split(text: str, at: int) -> PageData:
+    scanner = PageScanner()
+    if not scanner.feed(text[:at]):
+        scanner.feed(text[at:])
+    return scanner.result()
+
+
+@pytest.mark.parametrize("size", [1, 7, 8192])
+@pytest.mark.parametrize("name", PAGES)
+def test_fixture_pages(name: str, size: int) -> None:
+    """Each fixture page gives the same result in any chunk size."""
+    text = (FIXTURES / name).read_text(encoding="utf-8")
+    expected = extract_page(text)
+    assert expected.token or expected.customer_payload
+    assert _scan(text, size) == expected
+
+
+@pytest.mark.parametrize("text", [LOGIN_PAGE, CUSTOMER_PAGE, REPEATED_PAGE])
+def test_every_split(text: str) -> None:
+    """A page split in two at any offset gives the same result."""
+    expected = extract_page(text)
+    for at in range(len(text) + 1):
+        assert _scan_split(text, at) == expected, at
+
+
+def test_small_pages() -> None:
+    """The small pages are parsed as intended, escapes untouched."""
+    assert extract_page(LOGIN_PAGE) == PageData(
+        token="tok&en-1",
+        login_payload="{&quot;showCaptcha&quot;:false,&quot;x&quot;:&quot;a)b&quot;}",
+    )
+    assert extract_page(CUSTOMER_PAGE).customer_payload == (
+        '{\\"saldo\\":1.5,\\"note\\":\\"\\")\\" ,\\"x\\":1}'
+    )
+    assert extract_page(REPEATED_PAGE) == PageData(token="v1", login_payload="{}")
+
+
+def test_incomplete_page() -> None:
+    """A page cut off before the payload is closed has no payload."""
+    text = LOGIN_PAGE[: LOGIN_PAGE.index("login.init") + 20]
+    for size in (1, 7, 8192):
+        assert _scan(text, size) == extract_page(text)
+        assert _scan(text, size).login_payload is None
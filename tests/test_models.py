@@ -0,0 +1,137 @@
+"""Zone costs follow the local tariffs, also when the clocks change."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from custom_components.parkeeractie.models import LOCAL_TZ, Zone
+
+HOUR = 3600
+WEEK = 7 * 24 * HOUR
+
+# Ma-za 09:00-23:00 betaald, zondag alleen 13:00-18:00 en goedkoper
+ZONE = Zone.from_payload(
+    {
+        "zoneCode": "UT-B1",
+        "name": "B1",
+        "tariffs": [
+            {
+                "days": [0, 1, 2, 3, 4, 5],
+                "start": "09:00",
+                "end": "23:00",
+                "pricePerHour": 2.5,
+            },
+            {"days": [6], "start": "13:00", "end": "18:00", "pricePerHour": 1.0},
+        ],
+    }
+)
+# Elke nacht betaald, zodat de verzette klok binnen een tarief valt
+NIGHT_ZONE = Zone.from_payload(
+    {
+        "zoneCode": "UT-N1",
+        "name": None,
+        "tariffs": [
+            {
+                "days": [0, 1, 2, 3, 4, 5, 6],
+                "start": "00:00",
+                "end": "06:00",
+                "pricePerHour": 1.0,
+            },
+        ],
+    }
+)
+
+
+def _ts(*args: int) -> float:
+    return datetime(*args, tzinfo=LOCAL_TZ).timestamp()
+
+
+def test_cost_within_a_day() -> None:
+    """Only the paid part of a stay is charged."""
+    assert ZONE is not None
+    assert ZONE.cost(_ts(2026, 10, 16, 8, 0), _ts(2026, 10, 16, 10, 30)) == (
+        pytest.approx(3.75)
+    )
+    assert ZONE.cost(_ts(2026, 10, 16, 8, 59, 50), _ts(2026, 10, 16, 9, 0, 50)) == (
+        pytest.approx(50 / HOUR * 2.5)
+    )
+
+
+def test_cost_overnight() -> None:
+    """A stay over the free night pays for the hours on either side."""
+    assert ZONE is not None
+    assert ZONE.cost(_ts(2026, 10, 16, 22, 0), _ts(2026, 10, 17, 10, 0)) == (
+        pytest.approx(5.0)
+    )
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [
+        # Zomertijd begint zondag 29 maart 2026
+        ((2026, 3, 28, 22, 0), (2026, 3, 30, 10, 0)),
+        # Wintertijd begint zondag 25 oktober 2026
+        ((2026, 10, 24, 22, 0), (2026, 10, 26, 10, 0)),
+    ],
+)
+def test_cost_over_clock_change(start: tuple[int, ...], end: tuple[int, ...]) -> None:
+    """Sunday keeps its own tariff when the clocks change that night."""
+    assert ZONE is not None
+    assert ZONE.cost(_ts(*start), _ts(*end)) == pytest.approx(2.5 + 5 * 1.0 + 2.5)
+
+
+@pytest.mark.parametrize(
+    ("day", "hours"),
+    [
+        ((2026, 3, 29), 5.0),  # 02:00-03:00 bestaat niet
+        ((2026, 10, 25), 7.0),  # 02:00-03:00 komt twee keer
+        ((2026, 10, 18), 6.0),
+    ],
+)
+def test_cost_tariff_over_clock_change(day: tuple[int, ...], hours: float) -> None:
+    """A tariff spanning the clock change charges the real hours parked."""
+    assert NIGHT_ZONE is not None
+    assert NIGHT_ZONE.cost(_ts(*day, 0, 0), _ts(*day, 6, 0)) == pytest.approx(hours)
+
+
+def test_runway() -> None:
+    """The budget runs out on the local wall clock, free hours included."""
+    assert ZONE is not None
+    start = _ts(2026, 10, 16, 22, 0)
+    assert ZONE.runway(start, 5.0, WEEK) == pytest.approx(12 * HOUR)
+    start = _ts(2026, 10, 18, 8, 0)
+    assert ZONE.runway(start, 1.0, WEEK) == pytest.approx(6 * HOUR)
+
+
+@pytest.mark.parametrize(
+    ("start", "until"),
+    [
+        ((2026, 3, 28, 23, 0), (2026, 3, 29, 14, 0)),
+        ((2026, 10, 24, 23, 0), (2026, 10, 25, 14, 0)),
+    ],
+)
+def test_runway_over_clock_change(
+    start: tuple[int, ...], until: tuple[int, ...]
+) -> None:
+    """Over the clock change the paid Sunday hour still starts at 13:00."""
+    assert ZONE is not None
+    assert ZONE.runway(_ts(*start), 1.0, WEEK) == pytest.approx(
+        _ts(*until) - _ts(*start)
+    )
+
+
+def test_runway_beyond_horizon() -> None:
+    """A budget that lasts past the horizon gives None."""
+    assert ZONE is not None
+    assert ZONE.runway(_ts(2026, 10, 24, 22, 30), 100.0, 24 * HOUR) is None
+    assert ZONE.runway(_ts(2026, 10, 16, 22, 0), 0.0, WEEK) == 0.0
+
+
+def test_round_trip() -> None:
+    """A stored zone comes back equal."""
+    assert ZONE is not None
+    assert NIGHT_ZONE is not None
+    assert Zone.from_dict(ZONE.as_dict()) == ZONE
+    assert Zone.from_dict(NIGHT_ZONE.as_dict()) == NIGHT_ZONE